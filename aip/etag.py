@@ -0,0 +1,23 @@
+import hashlib
+from typing import Any
+
+
+# https://google.aip.dev/154
+def build_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(
+        ":".join(str(part) for part in parts).encode(), digest_size=12
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+# https://www.rfc-editor.org/rfc/rfc9110#section-13.1.2 (weak comparison)
+def match_etag(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,14 @@
+from typing import Sequence
+
+
+# https://google.aip.dev/157
+def parse_field_mask(field_mask: str, fields: Sequence[str]) -> list[str]:
+    if field_mask.strip() == "*":
+        return list(fields)
+    paths = {path.strip() for path in field_mask.split(",") if path.strip()}
+    unknown = sorted(paths.difference(fields))
+    if unknown:
+        raise ValueError(f"unknown field paths in field mask: {', '.join(unknown)}")
+    if not paths:
+        raise ValueError("field mask is empty.")
+    return [field for field in fields if field in paths]
@@ -0,0 +1,70 @@
+from itertools import permutations
+from typing import Iterable, Sequence
+
+
+Key = tuple[str, ...]
+
+
+#
+# Required keys
+#
+def order_by_combinations(
+    order_by_fields: Sequence[str], max_terms: int = 2
+) -> list[Key]:
+    return [
+        combination
+        for n in range(1, min(max_terms, len(order_by_fields)) + 1)
+        for combination in permutations(order_by_fields, n)
+    ]
+
+
+def required_keys(
+    filter_fields: Sequence[str],
+    order_by_fields: Sequence[str],
+    max_terms: int = 2,
+) -> list[Key]:
+    # an equality filter on one field followed by an order_by combination.
+    # index scans run in either direction, so asc/desc is not part of the key.
+    result: list[Key] = []
+    for prefix in [(), *((field,) for field in filter_fields)]:
+        fields = [field for field in order_by_fields if field not in prefix]
+        for combination in order_by_combinations(fields, max_terms):
+            key = (*prefix, *combination)
+            if key not in result:
+                result.append(key)
+    return result
+
+
+#
+# Indexes
+#
+def _covers(index: Sequence[str], key: Key) -> bool:
+    return tuple(index[: len(key)]) == key
+
+
+def recommend_indexes(
+    filter_fields: Sequence[str],
+    order_by_fields: Sequence[str],
+    tiebreaker: str = "id",
+    max_terms: int = 2,
+) -> list[Key]:
+    result: list[Key] = []
+    keys = required_keys(filter_fields, order_by_fields, max_terms)
+    for key in sorted(keys, key=len, reverse=True):
+        if not any(_covers(index, key) for index in result):
+            result.append((*key, tiebreaker))
+    return result
+
+
+def uncovered_keys(
+    indexes: Iterable[Sequence[str]],
+    filter_fields: Sequence[str],
+    order_by_fields: Sequence[str],
+    max_terms: int = 2,
+) -> list[Key]:
+    indexes = list(indexes)
+    return [
+        key
+        for key in required_keys(filter_fields, order_by_fields, max_terms)
+        if not any(_covers(index, key) for index in indexes)
+    ]
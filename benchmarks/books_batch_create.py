@@ -0,0 +1,50 @@
+"""books:batchCreate against the single create endpoint called in a loop.
+
+    $ python -m benchmarks.books_batch_create --books 1000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+async def run(books: int) -> tuple[float, float]:
+    from example.entrypoints.fastapi_ import app
+
+    await app.router.startup()
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        publisher = (await client.post("/publishers", json={"title": "bench"})).json()
+        url = f"/publishers/{publisher['id']}/books"
+        payloads = [
+            {"title": f"title {i}", "author_name": "author"} for i in range(books)
+        ]
+
+        started_at = time.perf_counter()
+        for payload in payloads:
+            response = await client.post(url, json=payload)
+            assert response.status_code == 200, response.text
+        single = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        response = await client.post(
+            f"{url}:batchCreate",
+            json={"requests": [{"book": payload} for payload in payloads]},
+        )
+        assert response.status_code == 200, response.text
+        batch = time.perf_counter() - started_at
+    await app.router.shutdown()
+    return single, batch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=1000)
+    args = parser.parse_args()
+    single, batch = asyncio.run(run(args.books))
+    print(
+        f"books={args.books:,} single={single:.2f}s ({args.books / single:,.0f}/s)"
+        f" batch={batch:.2f}s ({args.books / batch:,.0f}/s) speedup={single / batch:.1f}x"
+    )
@@ -0,0 +1,108 @@
+"""books:export throughput and peak RSS over a seeded SQLite file.
+
+    $ python -m benchmarks.books_export --rows 1000000
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import sqlite3
+import tempfile
+import time
+import uuid
+from typing import Any
+
+
+def _seed(path: str, rows: int):
+    from sqlalchemy import create_engine
+
+    from example.adapter.orm import mapper_registry
+
+    mapper_registry.metadata.create_all(create_engine(f"sqlite:///{path}"))
+    publisher_ids = [uuid.uuid4().hex for _ in range(100)]
+    connection = sqlite3.connect(path)
+    for start in range(0, rows, 100_000):
+        connection.executemany(
+            "INSERT INTO books VALUES (?, ?, ?, ?, 1)",
+            (
+                (uuid.uuid4().hex, publisher_ids[i % 100], f"title {i}", "author")
+                for i in range(start, min(start + 100_000, rows))
+            ),
+        )
+        connection.commit()
+    connection.close()
+
+
+def _max_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _export(app: Any) -> tuple[int, int]:
+    lines = 0
+    size = 0
+
+    requested = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal requested
+        if requested:
+            # the client never disconnects, StreamingResponse cancels this wait
+            await asyncio.Future()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]):
+        nonlocal lines, size
+        if message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            lines += body.count(b"\n")
+            size += len(body)
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/publishers/-/books:export",
+        "raw_path": b"/publishers/-/books:export",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    await app(scope, receive, send)
+    return lines, size
+
+
+async def run(rows: int):
+    from example.entrypoints.fastapi_ import app
+
+    await app.router.startup()
+    baseline = _max_rss_mib()
+    started_at = time.perf_counter()
+    lines, size = await _export(app)
+    elapsed = time.perf_counter() - started_at
+    await app.router.shutdown()
+    assert lines >= rows, (lines, rows)
+    print(
+        f"rows={lines:,} elapsed={elapsed:.1f}s throughput={lines / elapsed:,.0f} rows/s"
+        f" {size / elapsed / 2**20:,.1f} MiB/s"
+        f" peak_rss={_max_rss_mib():,.1f} MiB (after startup {baseline:,.1f} MiB)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "books.db")
+        seeder = multiprocessing.get_context("spawn").Process(
+            target=_seed, args=(path, args.rows)
+        )
+        seeder.start()
+        seeder.join()
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+        asyncio.run(run(args.rows))
@@ -0,0 +1,61 @@
+"""books:search latency with and without FAST_RESPONSES at several page sizes.
+
+    $ python -m benchmarks.books_search_serialization --requests 200
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+PAGE_SIZES = (30, 300, 1000)
+
+
+async def _measure(client: httpx.AsyncClient, page_size: int, requests: int) -> float:
+    params = {"page_size": page_size}
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get("/publishers/-/books:search", params=params)
+        assert response.status_code == 200, response.text
+    return (time.perf_counter() - started_at) / requests
+
+
+async def run(requests: int):
+    from example.config import settings
+    from example.entrypoints.fastapi_ import app
+
+    await app.router.startup()
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        publisher = (await client.post("/publishers", json={"title": "bench"})).json()
+        for start in range(0, max(PAGE_SIZES) * 2, 1000):
+            response = await client.post(
+                f"/publishers/{publisher['id']}/books:batchCreate",
+                json={
+                    "requests": [
+                        {"book": {"title": f"title {i}", "author_name": "author"}}
+                        for i in range(start, start + 1000)
+                    ]
+                },
+            )
+            assert response.status_code == 200, response.text
+        for page_size in PAGE_SIZES:
+            settings.FAST_RESPONSES = False
+            await _measure(client, page_size, 5)
+            slow = await _measure(client, page_size, requests)
+            settings.FAST_RESPONSES = True
+            await _measure(client, page_size, 5)
+            fast = await _measure(client, page_size, requests)
+            print(
+                f"page_size={page_size:>4} default={slow * 1000:.2f}ms"
+                f" fast={fast * 1000:.2f}ms speedup={slow / fast:.2f}x"
+            )
+    await app.router.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
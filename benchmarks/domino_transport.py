@@ -0,0 +1,77 @@
+"""SqliteBroker throughput across 1..N consumer processes.
+
+    $ python -m benchmarks.domino_transport --messages 20000 --processes 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any
+
+from domino.domino import Domino
+from domino.transport import Serializer, SqliteBroker, Transport
+from example.service.blocks.effects import SendMail
+
+
+async def _noop(eft: SendMail):
+    ...
+
+
+async def _consume(path: str, batch_size: int) -> tuple[int, float, float]:
+    domino = Domino()
+    domino.place(SendMail, _noop)
+    transport = Transport(
+        SqliteBroker(path), Serializer([SendMail]), batch_size=batch_size
+    )
+    consumed = 0
+    started_at = time.time()
+    while received := await transport.receive():
+        await asyncio.gather(*(domino.start(block) for _, block in received))
+        await transport.ack([message for message, _ in received])
+        consumed += len(received)
+    return consumed, started_at, time.time()
+
+
+def _worker(path: str, batch_size: int, results: "multiprocessing.Queue[Any]"):
+    results.put(asyncio.run(_consume(path, batch_size)))
+
+
+async def _publish(path: str, messages: int):
+    transport = Transport(SqliteBroker(path), Serializer([SendMail]))
+    blocks = [
+        SendMail(to="client", title="bench", body=str(i)) for i in range(messages)
+    ]
+    for i in range(0, messages, 1000):
+        await transport.send(blocks[i : i + 1000])
+
+
+def run(messages: int, processes: int, batch_size: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "broker.db")
+        asyncio.run(_publish(path, messages))
+        context = multiprocessing.get_context("spawn")
+        results: "multiprocessing.Queue[Any]" = context.Queue()
+        workers = [
+            context.Process(target=_worker, args=(path, batch_size, results))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        consumed, started_at, finished_at = zip(*(results.get() for _ in workers))
+        for worker in workers:
+            worker.join()
+    assert sum(consumed) == messages, (consumed, messages)
+    return messages / (max(finished_at) - min(started_at))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    for n in range(1, args.processes + 1):
+        throughput = run(args.messages, n, args.batch_size)
+        print(f"processes={n} throughput={throughput:,.0f} msg/s")
@@ -0,0 +1,96 @@
+"""Row-at-a-time ORM add/delete against add_many/delete_many.
+
+    $ python -m benchmarks.repository_bulk --rows 1000 100000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from example.adapter.orm import book_table, mapper_registry, start_mappers
+from example.adapter.repository import BookRepository
+from example.domain.book import Book
+
+
+async def _orm_add(books: BookRepository, rows: list[Book]):
+    for book in rows:
+        await books.add(book)
+
+
+async def _orm_delete(books: BookRepository, rows: list[Book]):
+    for book in rows:
+        await books.delete(book)
+
+
+async def _bulk_add(books: BookRepository, rows: list[Book]):
+    await books.add_many(rows)
+
+
+async def _bulk_delete(books: BookRepository, rows: list[Book]):
+    await books.delete_many([book.id for book in rows])
+
+
+async def _timed(
+    session: AsyncSession,
+    step: Callable[[BookRepository, list[Book]], Awaitable[None]],
+    rows: list[Book],
+) -> float:
+    started_at = time.perf_counter()
+    await step(BookRepository(session), rows)
+    await session.commit()
+    return time.perf_counter() - started_at
+
+
+async def run(n: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(mapper_registry.metadata.create_all)
+        publisher_id = uuid4()
+        timings: dict[str, float] = {}
+        for name, add, remove in (
+            ("orm", _orm_add, _orm_delete),
+            ("bulk", _bulk_add, _bulk_delete),
+        ):
+            rows = [
+                Book(
+                    id=uuid4(), publisher_id=publisher_id, title=f"{i}", author_name="a"
+                )
+                for i in range(n)
+            ]
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                timings[f"{name}_add"] = await _timed(session, add, rows)
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                if name == "orm":
+                    # the row-at-a-time path has to load what it deletes
+                    rows = await BookRepository(session).get_many(
+                        [book.id for book in rows]
+                    )
+                timings[f"{name}_delete"] = await _timed(session, remove, rows)
+                remaining = await session.scalar(
+                    select(func.count()).select_from(book_table)
+                )
+                assert remaining == 0, remaining
+        await engine.dispose()
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    args = parser.parse_args()
+    start_mappers()
+    for n in args.rows:
+        timings = asyncio.run(run(n))
+        print(
+            f"rows={n:,} "
+            + " ".join(f"{name}={seconds:.3f}s" for name, seconds in timings.items())
+        )
@@ -0,0 +1,124 @@
+"""Concurrent reads and writes against the default and WAL SQLite setups.
+
+    $ python -m benchmarks.sqlite_concurrency --readers 16 --writers 4 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Callable
+from uuid import uuid4
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from example.adapter.engine import build_engine
+from example.adapter.orm import book_table, mapper_registry
+from example.config import Settings
+
+SessionMaker = Callable[[], AsyncSession]
+
+
+def _book(publisher_id: str) -> dict[str, object]:
+    return dict(
+        id=uuid4(),
+        publisher_id=publisher_id,
+        title=f"title {random.random()}",
+        author_name="author",
+        _version_number=1,
+    )
+
+
+async def _seed(engine: AsyncEngine, rows: int) -> list[object]:
+    publisher_id = str(uuid4())
+    books = [_book(publisher_id) for _ in range(rows)]
+    async with engine.begin() as conn:
+        await conn.run_sync(mapper_registry.metadata.create_all)
+        await conn.execute(insert(book_table), books)
+    return [book["id"] for book in books]
+
+
+async def _reader(
+    Session: SessionMaker, ids: list[object], until: float, latencies: list[float]
+):
+    while time.perf_counter() < until:
+        started_at = time.perf_counter()
+        async with Session() as session:
+            book_id = random.choice(ids)
+            await session.execute(select(book_table).where(book_table.c.id == book_id))
+            # a books:search contains() filter, which scans the table inside sqlite
+            await session.execute(
+                select(book_table.c.id, book_table.c.title)
+                .where(book_table.c.title.contains(str(random.randint(100, 999))))
+                .order_by(book_table.c.title)
+                .limit(20)
+            )
+        latencies.append(time.perf_counter() - started_at)
+
+
+async def _writer(Session: SessionMaker, until: float, counts: dict[str, int]):
+    publisher_id = str(uuid4())
+    while time.perf_counter() < until:
+        async with Session() as session:
+            try:
+                await session.execute(insert(book_table), [_book(publisher_id)])
+                await session.commit()
+                counts["writes"] += 1
+            except OperationalError:
+                # database is locked
+                counts["errors"] += 1
+
+
+async def run(
+    mode: str, readers: int, writers: int, seconds: float, rows: int
+) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        if mode == "memory":
+            url = "sqlite+aiosqlite://"
+        else:
+            url = f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        settings = Settings(DATABASE_URL=url, DATABASE_SQLITE_WAL=mode == "wal")
+        writer = build_engine(url, settings)
+        reader = build_engine(url, settings, readonly=True) if mode == "wal" else writer
+        ids = await _seed(writer, rows)
+        Writer = sessionmaker(bind=writer, class_=AsyncSession)
+        Reader = sessionmaker(bind=reader, class_=AsyncSession)
+        latencies: list[float] = []
+        counts = {"writes": 0, "errors": 0}
+        until = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(_reader(Reader, ids, until, latencies) for _ in range(readers)),  # type: ignore
+            *(_writer(Writer, until, counts) for _ in range(writers)),  # type: ignore
+        )
+        await reader.dispose()
+        await writer.dispose()
+    latencies.sort()
+    return {
+        "reads": len(latencies) / seconds,
+        "writes": counts["writes"] / seconds,
+        "errors": counts["errors"],
+        "read_p50": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "read_p99": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+    for mode in ("memory", "file", "wal"):
+        result = asyncio.run(
+            run(mode, args.readers, args.writers, args.seconds, args.rows)
+        )
+        print(
+            f"{mode:<6} reads={result['reads']:,.0f}/s writes={result['writes']:,.0f}/s"
+            f" errors={result['errors']:,.0f} read_p50={result['read_p50']:.1f}ms"
+            f" read_p99={result['read_p99']:.1f}ms"
+        )
@@ -0,0 +1,108 @@
+"""CHAR(32) against BINARY(16) uuid storage on SQLite, each through the sqlite
+processors of Uuid and through the TypeDecorator path they replace.
+
+    $ python -m benchmarks.uuid_storage --rows 200000 --lookups 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, select
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from example.adapter.orm import Uuid
+
+
+class BaselineUuid(Uuid):
+    # process_bind_param and process_result_value layered on the impl type's own
+    # processors, as Uuid did before it installed its sqlite processors
+    cache_ok = True
+    bind_processor = TypeDecorator.bind_processor
+    result_processor = TypeDecorator.result_processor
+
+
+def _book_table(binary: bool, baseline: bool) -> Table:
+    uuid_type = BaselineUuid if baseline else Uuid
+    return Table(
+        "books",
+        MetaData(),
+        Column("id", uuid_type(binary=binary), primary_key=True),
+        Column("publisher_id", uuid_type(binary=binary), index=True),
+        Column("title", String(100)),
+        Column("author_name", String(50)),
+        Column("_version_number", Integer, nullable=False),
+    )
+
+
+async def run(
+    binary: bool, baseline: bool, rows: int, lookups: int
+) -> dict[str, float]:
+    books = _book_table(binary, baseline)
+    publisher_ids = [uuid.uuid4() for _ in range(100)]
+    values = [
+        {
+            "id": uuid.uuid4(),
+            "publisher_id": random.choice(publisher_ids),
+            "title": f"title {i}",
+            "author_name": "author",
+            "_version_number": 1,
+        }
+        for i in range(rows)
+    ]
+    ids = [value["id"] for value in random.sample(values, lookups)]
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(books.metadata.create_all)
+
+            started_at = time.perf_counter()
+            await conn.execute(books.insert(), values)
+            insert = rows / (time.perf_counter() - started_at)
+
+            started_at = time.perf_counter()
+            for book_id in ids:
+                point = select(books).where(books.c.id == book_id)
+                (await conn.execute(point)).one()
+            lookup = lookups / (time.perf_counter() - started_at)
+
+            scanned = 0
+            started_at = time.perf_counter()
+            for publisher_id in publisher_ids:
+                scan = select(books).where(books.c.publisher_id == publisher_id)
+                scanned += len((await conn.execute(scan)).all())
+            scan = scanned / (time.perf_counter() - started_at)
+            size = (
+                await conn.exec_driver_sql(
+                    "SELECT page_count * page_size FROM pragma_page_count(),"
+                    " pragma_page_size()"
+                )
+            ).scalar()
+        await engine.dispose()
+    return {
+        "insert rows/s": insert,
+        "lookup rows/s": lookup,
+        "scan rows/s": scan,
+        "db MiB": size / 2**20,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+    for binary in (False, True):
+        for baseline in (True, False):
+            result = asyncio.run(run(binary, baseline, args.rows, args.lookups))
+            print(
+                f"{'BINARY(16)' if binary else 'CHAR(32)':<10}"
+                f" {'baseline' if baseline else 'sqlite':<8} "
+                + " ".join(f"{name}={value:,.1f}" for name, value in result.items())
+            )
@@ -0,0 +1,55 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Literal
+
+from .block import IBlock
+
+
+LimitKind = Literal["depth", "blocks", "cycle"]
+
+
+class CascadeLimitExceeded(RuntimeError):
+    def __init__(self, kind: LimitKind, limit: int, block: IBlock, root: IBlock):
+        super().__init__(
+            f"cascade {kind} limit ({limit}) exceeded by {type(block).__name__}"
+            f" (root: {type(root).__name__})"
+        )
+        self.kind = kind
+        self.limit = limit
+        self.block = block
+        self.root = root
+
+
+@dataclass(kw_only=True)
+class Cascade:
+    root: IBlock
+    blocks: int = 0
+
+
+@dataclass(frozen=True, kw_only=True)
+class Origin:
+    # where a touched block came from, kept while a coalesce policy holds it
+    cascade: Cascade
+    lineage: tuple[IBlock, ...] = ()
+
+
+@dataclass(kw_only=True)
+class Budget:
+    max_depth: int = 16
+    max_blocks: int = 10_000
+    detect_cycles: bool = True
+    violations: Counter[LimitKind] = field(default_factory=Counter)
+
+    def check(self, cascade: Cascade, lineage: tuple[IBlock, ...], block: IBlock):
+        cascade.blocks += 1
+        kind: LimitKind
+        if self.detect_cycles and block in lineage:
+            kind, limit = "cycle", 0
+        elif len(lineage) > self.max_depth:
+            kind, limit = "depth", self.max_depth
+        elif cascade.blocks > self.max_blocks:
+            kind, limit = "blocks", self.max_blocks
+        else:
+            return
+        self.violations[kind] += 1
+        raise CascadeLimitExceeded(kind, limit, block, cascade.root)
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Protocol, TypeVar
+
+from .block import IBlock
+from .budget import Origin
+
+
+B = TypeVar("B", bound=IBlock)
+
+
+def _identity(block: Any) -> Hashable:
+    return block
+
+
+def _constant(_: Any) -> Hashable:
+    return None
+
+
+def _deepest(origins: list[Origin]) -> Origin:
+    # a merged block continues the longest of the cascades it came from, so a block
+    # type that touches itself still runs into the depth and cycle limits
+    return max(origins, key=lambda origin: len(origin.lineage))
+
+
+class ICoalescePolicy(Protocol):
+    window: float
+
+    @property
+    def pending(self) -> bool:
+        ...
+
+    def offer(self, block: Any, origin: Origin) -> list[tuple[IBlock, Origin]]:
+        ...
+
+    def drain(self) -> list[tuple[IBlock, Origin]]:
+        ...
+
+
+class Dedupe(Generic[B]):
+    def __init__(
+        self,
+        key: Callable[[B], Hashable] = _identity,
+        window: float = 1.0,
+        max_size: int = 10_000,
+    ) -> None:
+        self.key = key
+        self.window = window
+        self.max_size = max_size
+        self._seen: OrderedDict[Hashable, float] = OrderedDict()
+
+    @property
+    def pending(self) -> bool:
+        return False
+
+    def offer(self, block: B, origin: Origin) -> list[tuple[IBlock, Origin]]:
+        now = time.monotonic()
+        while self._seen:
+            oldest, expires_at = next(iter(self._seen.items()))
+            if expires_at > now:
+                break
+            del self._seen[oldest]
+        key = self.key(block)
+        if key in self._seen:
+            return []
+        self._seen[key] = now + self.window
+        if len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+        return [(block, origin)]
+
+    def drain(self) -> list[tuple[IBlock, Origin]]:
+        return []
+
+
+class Merge(Generic[B]):
+    def __init__(
+        self,
+        merge: Callable[[list[B]], IBlock],
+        key: Callable[[B], Hashable] = _constant,
+        window: float = 1.0,
+        max_size: int = 100,
+    ) -> None:
+        self.merge = merge
+        self.key = key
+        self.window = window
+        self.max_size = max_size
+        self._buckets: dict[Hashable, list[tuple[B, Origin]]] = {}
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._buckets)
+
+    def offer(self, block: B, origin: Origin) -> list[tuple[IBlock, Origin]]:
+        key = self.key(block)
+        bucket = self._buckets.setdefault(key, [])
+        bucket.append((block, origin))
+        if len(bucket) < self.max_size:
+            return []
+        del self._buckets[key]
+        return [self._merge(bucket)]
+
+    def drain(self) -> list[tuple[IBlock, Origin]]:
+        buckets, self._buckets = self._buckets, {}
+        return [self._merge(bucket) for bucket in buckets.values()]
+
+    def _merge(self, bucket: list[tuple[B, Origin]]) -> tuple[IBlock, Origin]:
+        blocks = [block for block, _ in bucket]
+        return self.merge(blocks), _deepest([origin for _, origin in bucket])
@@ -1,14 +1,34 @@
 import asyncio
-from contextvars import ContextVar, Token
+import logging
+from contextvars import Context, ContextVar, Token
+from functools import partial
 from types import TracebackType
-from typing import Any, ContextManager, Iterable, Literal, ParamSpec, TypeVar, overload
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Coroutine,
+    Iterable,
+    Literal,
+    ParamSpec,
+    TypeVar,
+    overload,
+)
 
 from typing_extensions import Self
 
 from .action import Action, ActionFunction
-from .block import IBlock
+from .block import IBlock, IExternalBlock
+from .budget import Budget, Cascade, CascadeLimitExceeded, Origin
+from .coalesce import ICoalescePolicy
+from .idempotency import IdempotencyStore
+from .retry import DeadLetter, DeadLetterStore, Retry
+from .scheduler import Priority, Scheduler
+from .transport import Transport
 
 
+logger = logging.getLogger(__name__)
+
 _touched_blocks_context_var: ContextVar[set[IBlock]] = ContextVar("touched_blocks")
 
 
@@ -37,14 +57,41 @@ def touch(*blocks: IBlock):
 
 B = TypeVar("B", bound=IBlock)
 P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def _detached(coroutine: Coroutine[Any, Any, T]) -> "asyncio.Task[T]":
+    # touched, retried and coalesced blocks start from an empty context, so what the
+    # caller bound to context variables (a request scoped session) is not shared with
+    # blocks running beside it or after it has returned
+    return Context().run(asyncio.create_task, coroutine)
 
 
 class Domino:
-    def __init__(self):
+    def __init__(
+        self,
+        scheduler: Scheduler | None = None,
+        dead_letters: DeadLetterStore | None = None,
+        budget: Budget | None = None,
+        idempotency: IdempotencyStore | None = None,
+    ):
+        self.scheduler = scheduler or Scheduler()
+        self.dead_letters = dead_letters or DeadLetterStore()
+        self.budget = budget or Budget()
+        self.idempotency = idempotency or IdempotencyStore()
         self._actions: dict[
             type[IBlock],
             Action[IBlock, ..., Any],
         ] = {}
+        self._priorities: dict[type[IBlock], Priority] = {}
+        self._unscheduled: set[type[IBlock]] = set()
+        self._retries: dict[type[IBlock], Retry] = {}
+        self._timeouts: dict[type[IBlock], float] = {}
+        self._policies: dict[type[IBlock], ICoalescePolicy] = {}
+        self._routes: dict[type[IBlock], Transport] = {}
+        self._flushers: dict[type[IBlock], asyncio.Task[None]] = {}
+        self._background: set[asyncio.Task[None]] = set()
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
 
     def place(
         self,
@@ -55,12 +102,90 @@ class Domino:
     ):
         self._actions[block_type] = Action(action_func, *args, **kwargs)
 
+    def prioritize(self, block_type: type[B], priority: Priority):
+        self._priorities[block_type] = priority
+
+    def unschedule(self, block_type: type[B]):
+        # long-running blocks, bounded by their caller (a worker pool), would hold a
+        # scheduler slot for their whole run
+        self._unscheduled.add(block_type)
+
+    def retry(self, block_type: type[B], policy: Retry):
+        self._retries[block_type] = policy
+
+    def timeout(self, block_type: type[B], seconds: float):
+        self._timeouts[block_type] = seconds
+
+    def coalesce(self, block_type: type[B], policy: ICoalescePolicy):
+        self._policies[block_type] = policy
+
+    def route(self, block_type: type[B], transport: Transport):
+        self._routes[block_type] = transport
+
+    async def consume(self, transport: Transport):
+        while True:
+            try:
+                received = await transport.receive()
+                if received:
+                    await asyncio.gather(
+                        *(self._start_external(block) for _, block in received)
+                    )
+                    await transport.ack([message for message, _ in received])
+            except Exception:
+                # the consumer outlives a failing broker, unacked messages are
+                # claimed again once their visibility timeout expires
+                logger.exception("consuming %s failed", transport.topic)
+                received = []
+            if not received:
+                await asyncio.sleep(transport.poll_interval)
+
+    async def flush(self):
+        for flusher in self._flushers.values():
+            flusher.cancel()
+        self._flushers.clear()
+        await self._propagate(
+            [
+                drained
+                for policy in self._policies.values()
+                for drained in policy.drain()
+            ]
+        )
+        while self._background:
+            await asyncio.gather(*self._background)
+
+    async def replay(
+        self, predicate: Callable[[DeadLetter], bool] | None = None
+    ) -> int:
+        letters = self.dead_letters.take(predicate)
+        # routed blocks that failed to send go back to their transport
+        routed = [
+            (letter.block, Origin(cascade=Cascade(root=letter.block)))
+            for letter in letters
+            if type(letter.block) in self._routes
+        ]
+        await asyncio.gather(
+            self._propagate(routed),
+            *(
+                self.start(letter.block, _direct=False)
+                if type(letter.block) in self._actions
+                # external blocks that failed to fall down have no action of their own
+                else self._start_external(letter.block)  # type: ignore
+                for letter in letters
+                if type(letter.block) not in self._routes
+            ),
+        )
+        return len(letters)
+
     @overload
     async def start(
         self,
         block: IBlock,
         return_effect: Literal[False] = False,
+        request_id: str | None = None,
         _direct: bool = True | False,
+        _attempt: int = 1,
+        _cascade: Cascade | None = None,
+        _lineage: tuple[IBlock, ...] = (),
     ) -> Any:
         ...
 
@@ -69,7 +194,11 @@ class Domino:
         self,
         block: IBlock,
         return_effect: Literal[True] = True,
+        request_id: str | None = None,
         _direct: bool = True | False,
+        _attempt: int = 1,
+        _cascade: Cascade | None = None,
+        _lineage: tuple[IBlock, ...] = (),
     ) -> tuple[Any, asyncio.Future[list[Any]]]:
         ...
 
@@ -77,42 +206,217 @@ class Domino:
         self,
         block: IBlock,
         return_effect: bool = False,
+        request_id: str | None = None,
         _direct: bool = True,
+        _attempt: int = 1,
+        _cascade: Cascade | None = None,
+        _lineage: tuple[IBlock, ...] = (),
     ):
+        if request_id is not None:
+            return await self._start_once(block, return_effect, request_id)
         block_type = type(block)
         action = self._actions.get(block_type, None)
         if action is None:
             raise RuntimeError(f"{block_type.__name__} is not placed.")
-        result, touched_blocks = await asyncio.create_task(
-            self._fall_down(block, action, raise_exception=_direct)
+        cascade = _cascade or Cascade(root=block)
+        if _attempt == 1:
+            try:
+                self.budget.check(cascade, _lineage, block)
+            except CascadeLimitExceeded as e:
+                await self.exception_fall_down(block, action, e)
+                if _direct:
+                    raise e
+                return None
+        result, touched_blocks = await self._run(
+            block, action, _direct, _attempt, cascade, _lineage
         )
-        effect = asyncio.gather(
-            *(self.start(block, _direct=False) for block in touched_blocks)
+        effect = self._propagate(
+            self._coalesce(
+                touched_blocks, Origin(cascade=cascade, lineage=(*_lineage, block))
+            )
         )
         if return_effect:
             return result, effect
         await effect
         return result
 
+    async def _start_once(self, block: IBlock, return_effect: bool, request_id: str):
+        key = f"{type(block).__name__}:{request_id}"
+        inflight = self._inflight.get(key, None)
+        if inflight is not None:
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # the first call was cancelled before it finished, this one runs instead
+                return await self._start_once(block, return_effect, request_id)
+            return (result, asyncio.gather()) if return_effect else result
+        inflight = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            found, result = await self.idempotency.get(key)
+            if found:
+                effect = asyncio.gather()
+            else:
+                result, effect = await self.start(block, return_effect=True)
+                await self.idempotency.set(key, result)
+        except Exception as e:
+            inflight.set_exception(e)
+            inflight.exception()
+            raise e
+        else:
+            inflight.set_result(result)
+        finally:
+            # cancellation skips both branches above, duplicates must not wait forever
+            if not inflight.done():
+                inflight.cancel()
+            del self._inflight[key]
+        if return_effect:
+            return result, effect
+        await effect
+        return result
+
+    async def _run(
+        self,
+        block: IBlock,
+        action: Action[IBlock, ..., Any],
+        direct: bool,
+        attempt: int,
+        cascade: Cascade,
+        lineage: tuple[IBlock, ...],
+    ) -> tuple[Any, list[IBlock]]:
+        block_type = type(block)
+        priority = self._priorities.get(block_type, Priority.NORMAL)
+        retry = self._retries.get(block_type, None)
+        timeout = self._timeouts.get(block_type, None)
+        while True:
+            fall_down = partial(self._fall_down, block, action, timeout)
+            try:
+                return await asyncio.create_task(
+                    fall_down()
+                    if block_type in self._unscheduled
+                    else self.scheduler.run(priority, fall_down)
+                )
+            except Exception as e:
+                if retry is not None and attempt < retry.max_attempts:
+                    delay = retry.delay(attempt)
+                    attempt += 1
+                    if direct:
+                        await asyncio.sleep(delay)
+                        continue
+                    self._spawn(
+                        self._retry_later(block, delay, attempt, cascade, lineage)
+                    )
+                elif direct:
+                    raise e
+                else:
+                    self.dead_letters.put(
+                        DeadLetter(block=block, exception=e, attempts=attempt)
+                    )
+                return None, []
+
+    def _propagate(
+        self, blocks: list[tuple[IBlock, Origin]]
+    ) -> asyncio.Future[list[Any]]:
+        local: list[tuple[IBlock, Origin]] = []
+        remote: dict[Transport, list[Any]] = {}
+        for block, origin in blocks:
+            transport = self._routes.get(type(block), None)
+            if transport is None:
+                local.append((block, origin))
+            else:
+                remote.setdefault(transport, []).append(block)
+        return asyncio.gather(
+            *(
+                _detached(
+                    self.start(
+                        block,
+                        _direct=False,
+                        _cascade=origin.cascade,
+                        _lineage=origin.lineage,
+                    )
+                )
+                for block, origin in local
+            ),
+            *(self._send(transport, blocks) for transport, blocks in remote.items()),
+        )
+
+    async def _send(self, transport: Transport, blocks: list[Any]):
+        try:
+            await transport.send(blocks)
+        except Exception as e:
+            # the touching action has committed already, its blocks wait for replay()
+            logger.exception("sending to %s failed", transport.topic)
+            for block in blocks:
+                self.dead_letters.put(DeadLetter(block=block, exception=e, attempts=1))
+
+    async def _start_external(self, block: IExternalBlock):
+        try:
+            blocks = await block.fall_down()
+        except Exception as e:
+            self.dead_letters.put(DeadLetter(block=block, exception=e, attempts=1))
+            return
+        await asyncio.gather(*(self.start(block, _direct=False) for block in blocks))
+
+    async def _retry_later(
+        self,
+        block: IBlock,
+        delay: float,
+        attempt: int,
+        cascade: Cascade,
+        lineage: tuple[IBlock, ...],
+    ):
+        await asyncio.sleep(delay)
+        await self.start(
+            block,
+            _direct=False,
+            _attempt=attempt,
+            _cascade=cascade,
+            _lineage=lineage,
+        )
+
+    def _spawn(self, coroutine: Coroutine[Any, Any, None]):
+        task = _detached(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _coalesce(
+        self, blocks: Iterable[IBlock], origin: Origin
+    ) -> list[tuple[IBlock, Origin]]:
+        result: list[tuple[IBlock, Origin]] = []
+        for block in blocks:
+            block_type = type(block)
+            policy = self._policies.get(block_type, None)
+            if policy is None:
+                result.append((block, origin))
+                continue
+            result.extend(policy.offer(block, origin))
+            if policy.pending and block_type not in self._flushers:
+                self._flushers[block_type] = _detached(
+                    self._flush_later(block_type, policy)
+                )
+        return result
+
+    async def _flush_later(self, block_type: type[IBlock], policy: ICoalescePolicy):
+        await asyncio.sleep(policy.window)
+        del self._flushers[block_type]
+        await self._propagate(policy.drain())
+
     async def _fall_down(
         self,
         block: IBlock,
         action: Action[IBlock, ..., Any],
-        raise_exception: bool = False,
+        timeout: float | None = None,
     ):
-        result: Any = None
-        touched_blocks: list[IBlock] = []
         try:
             await self.pre_fall_down(block, action)
             with TouchContext() as catcher:
-                result = await action(block)
-            touched_blocks.extend(catcher.touched_blocks)
+                result = await asyncio.wait_for(action(block), timeout)
             await self.post_fall_down(block, action, result)
         except Exception as e:
             await self.exception_fall_down(block, action, e)
-            if raise_exception:
-                raise e
-        return result, touched_blocks
+            raise e
+        return result, list(catcher.touched_blocks)
 
     async def pre_fall_down(
         self,
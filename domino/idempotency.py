@@ -0,0 +1,82 @@
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .action import run_in_threadpool
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS domino_idempotency (
+    key TEXT PRIMARY KEY,
+    result BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        path: str | None = None,
+        max_rows: int = 1_000_000,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_rows = max_rows
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        if path:
+            self._connection = sqlite3.connect(
+                path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SQLITE_SCHEMA)
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return True, self._cache[key]
+        if self._connection is None:
+            return False, None
+        row = await run_in_threadpool(self._select, key)
+        if row is None:
+            return False, None
+        result = pickle.loads(row[0])
+        self._remember(key, result)
+        return True, result
+
+    async def set(self, key: str, result: Any):
+        self._remember(key, result)
+        if self._connection is not None:
+            await run_in_threadpool(self._insert, key, pickle.dumps(result))
+
+    def _remember(self, key: str, result: Any):
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def _select(self, key: str) -> tuple[bytes] | None:
+        assert self._connection
+        with self._lock:
+            return self._connection.execute(
+                "SELECT result FROM domino_idempotency WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _insert(self, key: str, result: bytes):
+        assert self._connection
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO domino_idempotency (key, result, created_at)"
+                " VALUES (?, ?, ?)",
+                (key, result, time.time()),
+            )
+            self._connection.execute(
+                "DELETE FROM domino_idempotency WHERE rowid <="
+                " (SELECT MAX(rowid) FROM domino_idempotency) - ?",
+                (self.max_rows,),
+            )
@@ -0,0 +1,53 @@
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from .block import IBlock
+
+
+@dataclass(frozen=True, kw_only=True)
+class Retry:
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 10.0
+    factor: float = 2.0
+    jitter: bool = True
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.factor ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+@dataclass(frozen=True, kw_only=True)
+class DeadLetter:
+    block: IBlock
+    exception: Exception
+    attempts: int
+    failed_at: float = field(default_factory=time.time)
+
+
+class DeadLetterStore:
+    def __init__(self, maxlen: int = 1000) -> None:
+        self._letters: deque[DeadLetter] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self._letters)
+
+    def __iter__(self) -> Iterator[DeadLetter]:
+        return iter(list(self._letters))
+
+    def put(self, letter: DeadLetter):
+        self._letters.append(letter)
+
+    def take(
+        self, predicate: Callable[[DeadLetter], bool] | None = None
+    ) -> list[DeadLetter]:
+        taken: list[DeadLetter] = []
+        kept: list[DeadLetter] = []
+        for letter in self._letters:
+            (taken if predicate is None or predicate(letter) else kept).append(letter)
+        self._letters.clear()
+        self._letters.extend(kept)
+        return taken
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, TypeVar
+
+
+R = TypeVar("R")
+
+
+class Priority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+DEFAULT_WEIGHTS = {Priority.HIGH: 16, Priority.NORMAL: 4, Priority.LOW: 1}
+
+_slot_held_context_var: ContextVar[bool] = ContextVar("slot_held", default=False)
+
+
+@dataclass
+class QueueStats:
+    count: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def observe(self, wait: float):
+        self.count += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.count if self.count else 0.0
+
+
+class Scheduler:
+    def __init__(
+        self,
+        concurrency: int = 64,
+        weights: dict[Priority, int] = DEFAULT_WEIGHTS,
+    ) -> None:
+        self.concurrency = concurrency
+        self.weights = weights
+        self.stats = {priority: QueueStats() for priority in Priority}
+        self._running = 0
+        self._queues: dict[Priority, deque[tuple[float, asyncio.Future[None]]]] = {
+            priority: deque() for priority in Priority
+        }
+        self._passes = {priority: 0.0 for priority in Priority}
+        self._virtual_time = 0.0
+
+    async def run(self, priority: Priority, func: Callable[[], Awaitable[R]]) -> R:
+        if _slot_held_context_var.get():
+            # a start nested in a running action runs on its caller's slot, waiting for
+            # a slot of its own deadlocks once every slot is held by a waiting caller
+            return await func()
+        await self._acquire(priority)
+        token = _slot_held_context_var.set(True)
+        try:
+            return await func()
+        finally:
+            _slot_held_context_var.reset(token)
+            self._release()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            priority.name.lower(): {
+                "depth": len(self._queues[priority]),
+                "count": stats.count,
+                "mean_wait": stats.mean_wait,
+                "max_wait": stats.max_wait,
+            }
+            for priority, stats in self.stats.items()
+        }
+
+    async def _acquire(self, priority: Priority):
+        if self._running < self.concurrency and not any(self._queues.values()):
+            self._grant(priority, 0.0)
+            return
+        queue = self._queues[priority]
+        if not queue:
+            self._passes[priority] = max(self._passes[priority], self._virtual_time)
+        entry = (time.monotonic(), asyncio.get_running_loop().create_future())
+        queue.append(entry)
+        try:
+            await entry[1]
+        except asyncio.CancelledError:
+            if entry in queue:
+                queue.remove(entry)
+            elif not entry[1].cancelled():
+                # granted before the cancellation reached this task
+                self._release()
+            raise
+
+    def _release(self):
+        self._running -= 1
+        while self._running < self.concurrency:
+            waiting = [priority for priority in Priority if self._queues[priority]]
+            if not waiting:
+                return
+            priority = min(waiting, key=lambda p: (self._passes[p], p))
+            enqueued_at, future = self._queues[priority].popleft()
+            if future.done():
+                # cancelled after its turn came up, before its task woke to dequeue it
+                continue
+            self._grant(priority, time.monotonic() - enqueued_at)
+            future.set_result(None)
+
+    def _grant(self, priority: Priority, wait: float):
+        self._running += 1
+        self._virtual_time = self._passes[priority]
+        self._passes[priority] += 1 / self.weights[priority]
+        self.stats[priority].observe(wait)
@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Protocol, Sequence
+
+from .action import run_in_threadpool
+from .block import IExternalBlock, IPublicBlock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class Message:
+    id: int
+    body: bytes
+
+
+class IBroker(Protocol):
+    async def publish(self, topic: str, bodies: list[bytes]) -> None:
+        ...
+
+    async def claim(
+        self, topic: str, group: str, consumer: str, limit: int
+    ) -> list[Message]:
+        ...
+
+    async def ack(self, group: str, messages: list[Message]) -> None:
+        ...
+
+
+class Serializer:
+    def __init__(self, block_types: Iterable[type[IExternalBlock]]) -> None:
+        self._block_types = {
+            block_type.__name__: block_type for block_type in block_types
+        }
+
+    def dumps(self, block: IPublicBlock) -> bytes:
+        envelope = {"type": type(block).__name__, "body": block.to_json()}
+        return json.dumps(envelope).encode("utf-8")
+
+    def loads(self, data: bytes) -> IExternalBlock:
+        envelope = json.loads(data)
+        return self._block_types[envelope["type"]].from_json(envelope["body"])
+
+
+class Transport:
+    def __init__(
+        self,
+        broker: IBroker,
+        serializer: Serializer,
+        topic: str = "domino",
+        group: str = "domino",
+        consumer: str | None = None,
+        batch_size: int = 100,
+        poll_interval: float = 0.1,
+    ) -> None:
+        self.broker = broker
+        self.serializer = serializer
+        self.topic = topic
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+    async def send(self, blocks: Sequence[IPublicBlock]):
+        await self.broker.publish(
+            self.topic, [self.serializer.dumps(block) for block in blocks]
+        )
+
+    async def receive(self) -> list[tuple[Message, IExternalBlock]]:
+        messages = await self.broker.claim(
+            self.topic, self.group, self.consumer, self.batch_size
+        )
+        received: list[tuple[Message, IExternalBlock]] = []
+        rejected: list[Message] = []
+        for message in messages:
+            try:
+                received.append((message, self.serializer.loads(message.body)))
+            except Exception:
+                # a message no consumer can decode would be redelivered forever
+                logger.exception(
+                    "dropping undecodable message %s of %s", message.id, self.topic
+                )
+                rejected.append(message)
+        if rejected:
+            await self.ack(rejected)
+        return received
+
+    async def ack(self, messages: list[Message]):
+        await self.broker.ack(self.group, messages)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS domino_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    body BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_domino_messages_topic_id ON domino_messages (topic, id);
+CREATE TABLE IF NOT EXISTS domino_offsets (
+    consumer_group TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (consumer_group, topic)
+);
+CREATE TABLE IF NOT EXISTS domino_inflight (
+    consumer_group TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    consumer TEXT NOT NULL,
+    claimed_at REAL NOT NULL,
+    PRIMARY KEY (consumer_group, message_id)
+);
+"""
+
+
+class SqliteBroker:
+    def __init__(self, path: str, visibility_timeout: float = 30.0) -> None:
+        self.visibility_timeout = visibility_timeout
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SQLITE_SCHEMA)
+
+    async def publish(self, topic: str, bodies: list[bytes]) -> None:
+        await run_in_threadpool(self._publish, topic, bodies)
+
+    async def claim(
+        self, topic: str, group: str, consumer: str, limit: int
+    ) -> list[Message]:
+        return await run_in_threadpool(self._claim, topic, group, consumer, limit)
+
+    async def ack(self, group: str, messages: list[Message]) -> None:
+        await run_in_threadpool(self._ack, group, [message.id for message in messages])
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _publish(self, topic: str, bodies: list[bytes]):
+        now = time.time()
+        with self._lock, self._transaction():
+            self._connection.executemany(
+                "INSERT INTO domino_messages (topic, body, created_at) VALUES (?, ?, ?)",
+                [(topic, body, now) for body in bodies],
+            )
+
+    def _claim(self, topic: str, group: str, consumer: str, limit: int):
+        now = time.time()
+        with self._lock, self._transaction():
+            execute = self._connection.execute
+            expired = execute(
+                "SELECT m.id, m.body FROM domino_inflight i"
+                " JOIN domino_messages m ON m.id = i.message_id"
+                " WHERE i.consumer_group = ? AND m.topic = ? AND i.claimed_at < ?"
+                " ORDER BY m.id LIMIT ?",
+                (group, topic, now - self.visibility_timeout, limit),
+            ).fetchall()
+            row = execute(
+                "SELECT position FROM domino_offsets"
+                " WHERE consumer_group = ? AND topic = ?",
+                (group, topic),
+            ).fetchone()
+            position = row[0] if row else 0
+            fresh = execute(
+                "SELECT id, body FROM domino_messages"
+                " WHERE topic = ? AND id > ? ORDER BY id LIMIT ?",
+                (topic, position, limit - len(expired)),
+            ).fetchall()
+            claimed = expired + fresh
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO domino_inflight"
+                " (consumer_group, message_id, consumer, claimed_at)"
+                " VALUES (?, ?, ?, ?)",
+                [(group, id_, consumer, now) for id_, _ in claimed],
+            )
+            if fresh:
+                execute(
+                    "INSERT OR REPLACE INTO domino_offsets"
+                    " (consumer_group, topic, position) VALUES (?, ?, ?)",
+                    (group, topic, fresh[-1][0]),
+                )
+        return [Message(id=id_, body=body) for id_, body in claimed]
+
+    def _ack(self, group: str, message_ids: list[int]):
+        with self._lock, self._transaction():
+            self._connection.executemany(
+                "DELETE FROM domino_inflight"
+                " WHERE consumer_group = ? AND message_id = ?",
+                [(group, message_id) for message_id in message_ids],
+            )
+            # messages every group has read past and nobody holds are done with
+            self._connection.execute(
+                "DELETE FROM domino_messages"
+                " WHERE id <= (SELECT MIN(o.position) FROM domino_offsets o"
+                " WHERE o.topic = domino_messages.topic)"
+                " AND id NOT IN (SELECT message_id FROM domino_inflight)"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+class WorkerPool(Generic[T]):
+    def __init__(self, handler: Callable[[T], Awaitable[Any]], size: int = 4) -> None:
+        self.handler = handler
+        self.size = size
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self._queue: asyncio.Queue[T] = asyncio.Queue()
+        self._workers: list[asyncio.Task[None]] = []
+
+    def start(self):
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.size)]
+
+    async def stop(self):
+        # in-flight items are cancelled, their handlers must be safe to run again
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    def submit(self, item: T):
+        self._queue.put_nowait(item)
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "size": self.size,
+            "busy": self.busy,
+            "queued": self._queue.qsize(),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def _work(self):
+        while True:
+            item = await self._queue.get()
+            self.busy += 1
+            try:
+                await self.handler(item)
+                self.completed += 1
+            except Exception:
+                self.failed += 1
+            finally:
+                self.busy -= 1
+                self._queue.task_done()
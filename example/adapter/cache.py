@@ -0,0 +1,54 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import inspect
+
+from ..port.cache import IIdentityCache
+
+
+class IdentityCache(IIdentityCache):
+    def __init__(self, maxsize: int = 1000, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._entries: OrderedDict[
+            tuple[type[Any], Any], tuple[float, dict[str, Any]]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, entity_type: type[Any], entity_id: Any) -> dict[str, Any] | None:
+        key = (entity_type, entity_id)
+        entry = self._entries.get(key, None)
+        if entry is None:
+            return None
+        expires_at, values = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return values
+
+    def put(self, entity: Any):
+        mapper = inspect(type(entity))
+        values = {attr.key: getattr(entity, attr.key) for attr in mapper.column_attrs}
+        key = (type(entity), mapper.primary_key_from_instance(entity)[0])
+        self._entries[key] = (time.monotonic() + self.ttl, values)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, entity_type: type[Any], entity_id: Any):
+        self._entries.pop((entity_type, entity_id), None)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+        }
@@ -0,0 +1,169 @@
+import time
+from functools import partial
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
+
+from ..config import Settings
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.pools: list[Pool] = []
+        self.connects = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.max_in_use = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def instrument(self, engine: AsyncEngine):
+        pool = engine.sync_engine.pool
+        self.pools.append(pool)
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "invalidate", self._on_invalidate)
+        event.listen(pool, "checkout", self._on_checkout)
+
+    def observe_wait(self, seconds: float):
+        self.wait_count += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def in_use(self) -> int | None:
+        # a StaticPool hands its one connection to every session and counts nothing
+        if not all(isinstance(pool, QueuePool) for pool in self.pools):
+            return None
+        return sum(pool.checkedout() for pool in self.pools)  # type: ignore
+
+    def snapshot(self) -> dict[str, Any]:
+        queue_pools = [pool for pool in self.pools if isinstance(pool, QueuePool)]
+        in_use = self.in_use()
+        return {
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "checkouts": self.checkouts,
+            "in_use": in_use,
+            "max_in_use": self.max_in_use if in_use is not None else None,
+            "size": sum(pool.size() for pool in queue_pools),
+            "overflow": sum(max(pool.overflow(), 0) for pool in queue_pools),
+            "checkout_wait": {
+                "count": self.wait_count,
+                "mean": self.wait_total / self.wait_count if self.wait_count else 0.0,
+                "max": self.wait_max,
+            },
+        }
+
+    def _on_connect(self, *_: Any):
+        self.connects += 1
+
+    def _on_invalidate(self, *_: Any):
+        self.invalidations += 1
+
+    def _on_checkout(self, *_: Any):
+        self.checkouts += 1
+        in_use = self.in_use()
+        if in_use is not None:
+            self.max_in_use = max(self.max_in_use, in_use)
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def is_sqlite_wal(url: str, settings: Settings) -> bool:
+    # only file databases can journal to a write-ahead log
+    return (
+        settings.DATABASE_SQLITE_WAL
+        and make_url(url).get_backend_name() == "sqlite"
+        and not _is_memory_sqlite(url)
+    )
+
+
+def _sqlite_pragmas(settings: Settings, readonly: bool) -> list[str]:
+    pragmas = [
+        "journal_mode=WAL",
+        f"synchronous={settings.DATABASE_SQLITE_SYNCHRONOUS}",
+        f"cache_size={settings.DATABASE_SQLITE_CACHE_SIZE}",
+        f"mmap_size={settings.DATABASE_SQLITE_MMAP_SIZE}",
+        f"busy_timeout={settings.DATABASE_SQLITE_BUSY_TIMEOUT}",
+    ]
+    if readonly:
+        pragmas.append("query_only=ON")
+    return pragmas
+
+
+def _apply_pragmas(pragmas: list[str], dbapi_connection: Any, *_: Any):
+    cursor = dbapi_connection.cursor()
+    for pragma in pragmas:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+def _instrumented(pool_class: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    class InstrumentedPool(pool_class):  # type: ignore
+        def _do_get(self) -> Any:
+            started_at = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                metrics.observe_wait(time.perf_counter() - started_at)
+
+    return InstrumentedPool
+
+
+def build_engine(
+    url: str,
+    settings: Settings,
+    metrics: PoolMetrics | None = None,
+    readonly: bool = False,
+) -> AsyncEngine:
+    pool_class: type[Pool]
+    options: dict[str, Any] = {}
+    wal = is_sqlite_wal(url, settings)
+    if _is_memory_sqlite(url):
+        # in-memory database lives as long as its single connection
+        pool_class = StaticPool
+    elif wal:
+        # sqlite takes one writer at a time, so writes queue on a single connection
+        # in process instead of spinning on SQLITE_BUSY. readers never block it.
+        pool_class = AsyncAdaptedQueuePool
+        options.update(
+            pool_size=settings.DATABASE_SQLITE_READER_POOL_SIZE if readonly else 1,
+            max_overflow=0,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        )
+    else:
+        pool_class = AsyncAdaptedQueuePool
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        )
+    engine = create_async_engine(
+        url,
+        future=True,
+        echo=settings.DATABASE_ECHO,
+        poolclass=_instrumented(pool_class, metrics) if metrics else pool_class,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+        **options,
+    )
+    if wal:
+        event.listen(
+            engine.sync_engine,
+            "connect",
+            partial(_apply_pragmas, _sqlite_pragmas(settings, readonly)),
+        )
+    if metrics:
+        metrics.instrument(engine)
+    return engine
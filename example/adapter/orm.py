@@ -1,12 +1,29 @@
 import uuid
+from operator import attrgetter
 from typing import Any
 
-from sqlalchemy import Column, Integer, String, Table
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    literal_column,
+    select,
+)
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import registry
-from sqlalchemy.types import CHAR, TypeDecorator
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import BINARY, CHAR, TypeDecorator
 
+from ..config import settings
 from ..domain.book import Book
+from ..domain.operation import Operation
 from ..domain.publisher import Publisher
 
 
@@ -14,37 +31,68 @@ class Uuid(TypeDecorator[Any]):
     """Platform-independent UUID type.
 
     Uses PostgreSQL's UUID type, otherwise uses
-    CHAR(32), storing as stringified hex values.
+    CHAR(32), storing as stringified hex values,
+    or BINARY(16) when binary is set.
     """
 
     impl = CHAR
     cache_ok = True
 
+    def __init__(self, binary: bool = False):
+        super().__init__()
+        self.binary = binary
+
     def load_dialect_impl(self, dialect: Any):
         if dialect.name == "postgresql":
             return dialect.type_descriptor(postgresql.UUID())
+        elif self.binary:
+            return dialect.type_descriptor(BINARY(16))
         else:
             return dialect.type_descriptor(CHAR(32))
 
     def process_bind_param(self, value: Any, dialect: Any) -> Any:
         if value is None:
             return value
-        elif dialect.name == "postgresql":
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(value)
+        if dialect.name == "postgresql":
             return str(value)
+        elif self.binary:
+            return value.bytes
         else:
-            if not isinstance(value, uuid.UUID):
-                return "%.32x" % uuid.UUID(value).int
-            else:
-                # hexstring
-                return "%.32x" % value.int
+            # hexstring
+            return value.hex
 
     def process_result_value(self, value: Any, dialect: Any) -> Any:
-        if value is None:
+        if value is None or isinstance(value, uuid.UUID):
             return value
+        elif isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
         else:
+            return uuid.UUID(value)
+
+    # sqlite3 takes and returns str and bytes as they are, so the sqlite processors
+    # skip the impl type's own processors (BINARY wraps every value in a memoryview).
+    def bind_processor(self, dialect: Any) -> Any:
+        if dialect.name != "sqlite":
+            return super().bind_processor(dialect)
+        to_db = attrgetter("bytes" if self.binary else "hex")
+
+        def process(value: Any) -> Any:
+            if value is None:
+                return value
             if not isinstance(value, uuid.UUID):
                 value = uuid.UUID(value)
-            return value
+            return to_db(value)
+
+        return process
+
+    def result_processor(self, dialect: Any, coltype: Any) -> Any:
+        if dialect.name != "sqlite":
+            return super().result_processor(dialect, coltype)
+        if self.binary:
+            return lambda value: None if value is None else uuid.UUID(bytes=value)
+        return lambda value: None if value is None else uuid.UUID(value)
 
 
 mapper_registry = registry()
@@ -53,7 +101,7 @@ mapper_registry = registry()
 publisher_table = Table(
     "publishers",
     mapper_registry.metadata,
-    Column("id", Uuid, primary_key=True),
+    Column("id", Uuid(binary=settings.DATABASE_UUID_BINARY), primary_key=True),
     Column("title", String(100)),
     Column("_version_number", Integer, nullable=False),
 )
@@ -62,14 +110,118 @@ publisher_table = Table(
 book_table = Table(
     "books",
     mapper_registry.metadata,
-    Column("id", Uuid, primary_key=True),
-    Column("publisher_id", Uuid),
+    Column("id", Uuid(binary=settings.DATABASE_UUID_BINARY), primary_key=True),
+    Column("publisher_id", Uuid(binary=settings.DATABASE_UUID_BINARY)),
     Column("title", String(100)),
     Column("author_name", String(50)),
     Column("_version_number", Integer, nullable=False),
+    # aip.index.recommend_indexes for the fields books:search filters and orders by
+    Index(
+        "ix_books_publisher_id_title_author_name_id",
+        "publisher_id",
+        "title",
+        "author_name",
+        "id",
+    ),
+    Index(
+        "ix_books_publisher_id_author_name_title_id",
+        "publisher_id",
+        "author_name",
+        "title",
+        "id",
+    ),
+    Index("ix_books_title_author_name_id", "title", "author_name", "id"),
+    Index("ix_books_author_name_title_id", "author_name", "title", "id"),
+)
+
+
+operation_table = Table(
+    "operations",
+    mapper_registry.metadata,
+    Column("id", Uuid(binary=settings.DATABASE_UUID_BINARY), primary_key=True),
+    Column("kind", String(50), nullable=False),
+    Column("parent_id", Uuid(binary=settings.DATABASE_UUID_BINARY)),
+    Column("source_path", String(255), nullable=False),
+    Column("source_format", String(10), nullable=False),
+    Column("done", Boolean, nullable=False),
+    Column("cancel_requested", Boolean, nullable=False),
+    Column("owner", String(32)),
+    Column("lease_expire_time", DateTime),
+    Column("attempts", Integer, nullable=False),
+    Column("error_code", Integer),
+    Column("error_message", String(255)),
+    Column("processed_rows", Integer, nullable=False),
+    Column("created_rows", Integer, nullable=False),
+    Column("failed_rows", Integer, nullable=False),
+    Column("failures", JSON, nullable=False),
+    Column("create_time", DateTime, nullable=False),
+    Column("update_time", DateTime, nullable=False),
+    # unfinished operations are resumed on startup
+    Index("ix_operations_done", "done"),
 )
 
 
+# full-text index backing contains() on books, kept in sync by triggers.
+# sqlite uses an fts5 trigram table over books' rowid, postgresql uses pg_trgm
+# gin indexes which LIKE can use as is.
+FULLTEXT_COLUMNS = ("title", "author_name")
+FULLTEXT_MIN_LENGTH = 3  # trigrams cannot match anything shorter
+
+books_fts_table = Table(
+    "books_fts",
+    MetaData(),  # not created by create_all, see create_fulltext_index
+    Column("rowid", Integer, primary_key=True),
+    *(Column(name, String) for name in FULLTEXT_COLUMNS),
+)
+
+_SQLITE_FULLTEXT_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5("
+    "title, author_name, content='books', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN"
+    " INSERT INTO books_fts (rowid, title, author_name)"
+    " VALUES (new.rowid, new.title, new.author_name); END",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN"
+    " INSERT INTO books_fts (books_fts, rowid, title, author_name)"
+    " VALUES ('delete', old.rowid, old.title, old.author_name); END",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE ON books BEGIN"
+    " INSERT INTO books_fts (books_fts, rowid, title, author_name)"
+    " VALUES ('delete', old.rowid, old.title, old.author_name);"
+    " INSERT INTO books_fts (rowid, title, author_name)"
+    " VALUES (new.rowid, new.title, new.author_name); END",
+]
+
+_POSTGRESQL_FULLTEXT_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    *(
+        f"CREATE INDEX IF NOT EXISTS ix_books_{name}_trgm"
+        f" ON books USING gin ({name} gin_trgm_ops)"
+        for name in FULLTEXT_COLUMNS
+    ),
+]
+
+
+def create_fulltext_index(conn: Connection, rebuild: bool = False):
+    if conn.dialect.name == "sqlite":
+        existed = conn.dialect.has_table(conn, books_fts_table.name)
+        for ddl in _SQLITE_FULLTEXT_DDL:
+            conn.exec_driver_sql(ddl)
+        if rebuild or not existed:
+            # rowids of books are not stable across VACUUM, rebuild after one
+            conn.exec_driver_sql("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+    elif conn.dialect.name == "postgresql":
+        for ddl in _POSTGRESQL_FULLTEXT_DDL:
+            conn.exec_driver_sql(ddl)
+
+
+def fulltext_contains(name: str, value: str) -> ColumnElement[Any]:
+    phrase = '"' + value.replace('"', '""') + '"'
+    return literal_column(f"{book_table.name}.rowid").in_(
+        select(books_fts_table.c.rowid).where(
+            books_fts_table.c[name].op("MATCH")(phrase)
+        )
+    )
+
+
 def start_mappers():
     mapper_registry.map_imperatively(
         Book,
@@ -81,3 +233,6 @@ def start_mappers():
         publisher_table,
         version_id_col=publisher_table.c._version_number,
     )
+    # no version counter, import progress and a cancel request are written by
+    # different sessions and each one only flushes the columns it changed
+    mapper_registry.map_imperatively(Operation, operation_table)
@@ -1,44 +1,258 @@
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence, TypeVar
 from uuid import UUID
 from ..domain.book import Book
+from ..domain.operation import Operation
 from ..domain.publisher import Publisher
-from ..port.repository import IBookRepository, IPublisherRepository
+from ..port.repository import (
+    IBookRepository,
+    IOperationRepository,
+    IPublisherRepository,
+)
+from .cache import IdentityCache
 
+from sqlalchemy import delete, inspect, insert, not_, or_, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from sqlalchemy.sql.selectable import Select
 
+E = TypeVar("E")
+
+CHUNK_SIZE = 500
+
+
+async def _get(
+    session: AsyncSession,
+    cache: IdentityCache | None,
+    entity_type: type[E],
+    entity_id: Any,
+) -> E | None:
+    if cache is None:
+        return await session.get(entity_type, entity_id)
+    identity_key = session.sync_session.identity_key(entity_type, entity_id)
+    if identity_key in session.identity_map:
+        return await session.get(entity_type, entity_id)
+    values = cache.get(entity_type, entity_id)
+    if values is not None:
+        # a cached snapshot is only served while its version is still current.
+        mapper = inspect(entity_type)
+        version = await session.scalar(
+            select(mapper.version_id_col).where(mapper.primary_key[0] == entity_id)
+        )
+        version_key = mapper.get_property_by_column(mapper.version_id_col).key
+        if version == values[version_key]:
+            cache.hits += 1
+            entity = entity_type(**values)
+            make_transient_to_detached(entity)
+            session.add(entity)
+            return entity
+        cache.stale += 1
+        cache.invalidate(entity_type, entity_id)
+    else:
+        cache.misses += 1
+    entity = await session.get(entity_type, entity_id)
+    if entity is not None:
+        cache.put(entity)
+    return entity
+
+
+def _chunks(values: Sequence[Any]) -> list[Sequence[Any]]:
+    return [values[i : i + CHUNK_SIZE] for i in range(0, len(values), CHUNK_SIZE)]
+
+
+async def _add_many(session: AsyncSession, entities: Sequence[Any]):
+    if not entities:
+        return
+    mapper = inspect(type(entities[0]))
+    columns = [
+        (column.key, mapper.get_property_by_column(column).key)
+        for column in mapper.local_table.columns
+    ]
+    if mapper.version_id_col is not None:
+        version_key = mapper.get_property_by_column(mapper.version_id_col).key
+        for entity in entities:
+            # same initial version the mapper's version counter assigns on flush
+            setattr(entity, version_key, 1)
+    for chunk in _chunks(entities):
+        await session.execute(
+            insert(mapper.local_table),
+            [{key: getattr(entity, attr) for key, attr in columns} for entity in chunk],
+        )
+
+
+async def _get_many(
+    session: AsyncSession, entity_type: type[E], entity_ids: Sequence[Any]
+) -> list[E]:
+    mapper = inspect(entity_type)
+    found: dict[Any, E] = {}
+    for chunk in _chunks(entity_ids):
+        result = await session.execute(
+            select(entity_type).where(mapper.primary_key[0].in_(chunk))
+        )
+        found.update(
+            (mapper.primary_key_from_instance(entity)[0], entity)
+            for entity in result.scalars()
+        )
+    return [found[entity_id] for entity_id in entity_ids if entity_id in found]
+
+
+async def _delete_many(
+    session: AsyncSession,
+    cache: IdentityCache | None,
+    entity_type: type[Any],
+    entity_ids: Sequence[Any],
+) -> int:
+    mapper = inspect(entity_type)
+    primary_key = getattr(
+        entity_type, mapper.get_property_by_column(mapper.primary_key[0]).key
+    )
+    deleted = 0
+    for chunk in _chunks(entity_ids):
+        result = await session.execute(
+            delete(entity_type)
+            .where(primary_key.in_(chunk))
+            .execution_options(synchronize_session="evaluate")
+        )
+        deleted += result.rowcount
+    if cache is not None:
+        for entity_id in entity_ids:
+            cache.invalidate(entity_type, entity_id)
+    return deleted
+
+
+async def _stream_rows(
+    session: AsyncSession, select: Select, chunk_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    # yield_per keeps a server side cursor open and buffers one chunk at a time
+    result = await session.stream(select.execution_options(yield_per=chunk_size))
+    async for rows in result.partitions(chunk_size):
+        yield rows
+
 
 @dataclass
 class BookRepository(IBookRepository):
 
     _session: AsyncSession
+    _cache: IdentityCache | None = None
 
     async def add(self, book: Book) -> None:
         self._session.add(book)
 
+    async def add_many(self, books: Sequence[Book]) -> None:
+        await _add_many(self._session, books)
+
     async def get(self, book_id: UUID) -> Book | None:
-        return await self._session.get(Book, book_id)
+        return await _get(self._session, self._cache, Book, book_id)
+
+    async def get_many(self, book_ids: Sequence[UUID]) -> list[Book]:
+        return await _get_many(self._session, Book, book_ids)
 
     async def query(self, select: Select) -> list[Book]:
         return (await self._session.execute(select)).scalars().all()
 
+    async def query_rows(self, select: Select) -> list[Row]:
+        return (await self._session.execute(select)).all()
+
+    def stream_rows(
+        self, select: Select, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        return _stream_rows(self._session, select, chunk_size)
+
     async def delete(self, book: Book) -> None:
         await self._session.delete(book)
 
+    async def delete_many(self, book_ids: Sequence[UUID]) -> int:
+        return await _delete_many(self._session, self._cache, Book, book_ids)
+
 
 @dataclass
 class PublisherRepository(IPublisherRepository):
 
     _session: AsyncSession
+    _cache: IdentityCache | None = None
 
     async def add(self, publisher: Publisher) -> None:
         self._session.add(publisher)
 
+    async def add_many(self, publishers: Sequence[Publisher]) -> None:
+        await _add_many(self._session, publishers)
+
     async def get(self, publisher_id: UUID) -> Publisher | None:
-        return await self._session.get(Publisher, publisher_id)
+        return await _get(self._session, self._cache, Publisher, publisher_id)
+
+    async def get_many(self, publisher_ids: Sequence[UUID]) -> list[Publisher]:
+        return await _get_many(self._session, Publisher, publisher_ids)
 
     async def query(self, select: Select) -> list[Publisher]:
         return (await self._session.execute(select)).scalars().all()
 
+    async def query_rows(self, select: Select) -> list[Row]:
+        return (await self._session.execute(select)).all()
+
+    def stream_rows(
+        self, select: Select, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        return _stream_rows(self._session, select, chunk_size)
+
     async def delete(self, publisher: Publisher) -> None:
-        await self._session.delete(publisher)
\ No newline at end of file
+        await self._session.delete(publisher)
+
+    async def delete_many(self, publisher_ids: Sequence[UUID]) -> int:
+        return await _delete_many(self._session, self._cache, Publisher, publisher_ids)
+
+
+@dataclass
+class OperationRepository(IOperationRepository):
+
+    _session: AsyncSession
+
+    async def add(self, operation: Operation) -> None:
+        self._session.add(operation)
+
+    async def add_many(self, operations: Sequence[Operation]) -> None:
+        await _add_many(self._session, operations)
+
+    async def get(self, operation_id: UUID) -> Operation | None:
+        return await self._session.get(Operation, operation_id)
+
+    async def get_many(self, operation_ids: Sequence[UUID]) -> list[Operation]:
+        return await _get_many(self._session, Operation, operation_ids)
+
+    async def query(self, select: Select) -> list[Operation]:
+        return (await self._session.execute(select)).scalars().all()
+
+    async def query_rows(self, select: Select) -> list[Row]:
+        return (await self._session.execute(select)).all()
+
+    def stream_rows(
+        self, select: Select, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        return _stream_rows(self._session, select, chunk_size)
+
+    async def delete(self, operation: Operation) -> None:
+        await self._session.delete(operation)
+
+    async def delete_many(self, operation_ids: Sequence[UUID]) -> int:
+        return await _delete_many(self._session, None, Operation, operation_ids)
+
+    async def claim(
+        self, operation_id: UUID, owner: str, lease_expire_time: datetime
+    ) -> bool:
+        # a single conditional update, so of two racing runs only one changes the row
+        result = await self._session.execute(
+            update(Operation)
+            .where(
+                Operation.id == operation_id,  # type: ignore
+                not_(Operation.done),  # type: ignore
+                or_(
+                    Operation.owner.is_(None),  # type: ignore
+                    Operation.owner == owner,  # type: ignore
+                    Operation.lease_expire_time < datetime.utcnow(),  # type: ignore
+                ),
+            )
+            .values(owner=owner, lease_expire_time=lease_expire_time)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
@@ -0,0 +1,243 @@
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import Integer, Table, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .orm import book_table, publisher_table
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None  # type: ignore
+
+
+SNAPSHOT_TABLES: dict[str, Table] = {
+    "publishers": publisher_table,
+    "books": book_table,
+}
+SNAPSHOT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+MANIFEST = "manifest.json"
+# every snapshot keeps the full (id, _version_number) list of each table,
+# always as an arrow ipc file so the next incremental run can memory map it
+VERSIONS_SUFFIX = ".versions.arrow"
+
+
+#
+# Report
+#
+@dataclass(kw_only=True)
+class TableSnapshot:
+    name: str
+    rows: int = 0
+    exported_rows: int = 0
+    deleted_rows: int = 0
+    seconds: float = 0.0
+    files: list[str] = field(default_factory=list)
+
+
+@dataclass(kw_only=True)
+class SnapshotReport:
+    format: str
+    base: str | None
+    create_time: str
+    tables: dict[str, TableSnapshot] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+#
+# Transaction
+#
+@asynccontextmanager
+async def snapshot_connection(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            # pysqlite only begins before writes, so without an explicit BEGIN
+            # every select would read its own snapshot
+            await conn.exec_driver_sql("BEGIN")
+        else:
+            conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+            await conn.begin()
+        try:
+            yield conn
+        finally:
+            await conn.rollback()
+
+
+#
+# Arrow
+#
+def _arrow_schema(table: Table) -> "pyarrow.Schema":
+    fields = []
+    for column in table.columns:
+        arrow_type = (
+            pyarrow.int64() if isinstance(column.type, Integer) else pyarrow.string()
+        )
+        fields.append(pyarrow.field(column.key, arrow_type, nullable=column.nullable))
+    return pyarrow.schema(fields)
+
+
+def _record_batch(
+    schema: "pyarrow.Schema", rows: Sequence[Row]
+) -> "pyarrow.RecordBatch":
+    columns = []
+    for i, column in enumerate(schema):
+        values = [row[i] for row in rows]
+        if column.type == pyarrow.string():
+            values = [None if value is None else str(value) for value in values]
+        columns.append(pyarrow.array(values, type=column.type))
+    return pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class _BatchWriter:
+    def __init__(self, path: str, schema: "pyarrow.Schema", format: str) -> None:
+        self.path = path
+        self.rows = 0
+        if format == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(
+                path, schema, compression="zstd"
+            )
+        else:
+            self._writer = pyarrow.ipc.new_file(path, schema)
+
+    def write(self, batch: "pyarrow.RecordBatch"):
+        if batch.num_rows:
+            self._writer.write_batch(batch)
+            self.rows += batch.num_rows
+
+    def close(self):
+        self._writer.close()
+
+
+def _read_versions(path: str) -> dict[str, int]:
+    with pyarrow.memory_map(path) as source:
+        versions = pyarrow.ipc.open_file(source).read_all()
+    return dict(
+        zip(
+            versions.column("id").to_pylist(),
+            versions.column("_version_number").to_pylist(),
+        )
+    )
+
+
+#
+# Export
+#
+async def _export_table(
+    conn: AsyncConnection,
+    name: str,
+    table: Table,
+    directory: str,
+    format: str,
+    base: str | None,
+    batch_size: int,
+) -> TableSnapshot:
+    started_at = time.perf_counter()
+    snapshot = TableSnapshot(name=name)
+    schema = _arrow_schema(table)
+    previous = (
+        _read_versions(os.path.join(base, name + VERSIONS_SUFFIX)) if base else None
+    )
+    suffix = SNAPSHOT_FORMATS[format]
+    rows_writer = _BatchWriter(os.path.join(directory, name + suffix), schema, format)
+    versions_writer = _BatchWriter(
+        os.path.join(directory, name + VERSIONS_SUFFIX),
+        pyarrow.schema([schema.field("id"), schema.field("_version_number")]),
+        "arrow",
+    )
+    writers = [rows_writer, versions_writer]
+    try:
+        result = await conn.stream(
+            select(table).order_by(table.c.id).execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions(batch_size):
+            batch = _record_batch(schema, rows)
+            snapshot.rows += batch.num_rows
+            versions_writer.write(batch.select(["id", "_version_number"]))
+            if previous is not None:
+                # rows whose version moved since the base snapshot, new rows included;
+                # what is left in previous afterwards was deleted
+                changed = [
+                    previous.pop(row_id, None) != version
+                    for row_id, version in zip(
+                        batch.column("id").to_pylist(),
+                        batch.column("_version_number").to_pylist(),
+                    )
+                ]
+                batch = batch.filter(pyarrow.array(changed))
+            rows_writer.write(batch)
+        if previous is not None:
+            deleted_schema = pyarrow.schema([schema.field("id")])
+            deleted_writer = _BatchWriter(
+                os.path.join(directory, name + ".deleted" + suffix),
+                deleted_schema,
+                format,
+            )
+            writers.append(deleted_writer)
+            deleted_writer.write(
+                pyarrow.record_batch(
+                    [pyarrow.array(sorted(previous), type=pyarrow.string())],
+                    schema=deleted_schema,
+                )
+            )
+    finally:
+        for writer in writers:
+            writer.close()
+    snapshot.exported_rows = rows_writer.rows
+    snapshot.deleted_rows = len(previous) if previous is not None else 0
+    snapshot.files = [os.path.basename(writer.path) for writer in writers]
+    snapshot.seconds = time.perf_counter() - started_at
+    return snapshot
+
+
+async def export_snapshot(
+    engine: AsyncEngine,
+    directory: str,
+    *,
+    format: str = "parquet",
+    base: str | None = None,
+    batch_size: int = 50_000,
+) -> SnapshotReport:
+    if pyarrow is None:
+        raise RuntimeError(
+            "pyarrow is required to export snapshots, install the snapshot extra."
+        )
+    if format not in SNAPSHOT_FORMATS:
+        raise ValueError(f"unknown snapshot format: {format}")
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        raise FileExistsError(f"{directory} already holds a snapshot.")
+    os.makedirs(directory, exist_ok=True)
+    started_at = time.perf_counter()
+    report = SnapshotReport(
+        format=format,
+        base=base,
+        create_time=datetime.now(timezone.utc).isoformat(),
+    )
+    async with snapshot_connection(engine) as conn:
+        for name, table in SNAPSHOT_TABLES.items():
+            report.tables[name] = await _export_table(
+                conn, name, table, directory, format, base, batch_size
+            )
+    report.seconds = time.perf_counter() - started_at
+    # written last, so a directory without a manifest is an unfinished snapshot
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as file:
+        json.dump(asdict(report), file, indent=2)
+    return report
+
+
+def read_snapshot_table(directory: str, name: str) -> Any:
+    # arrow ipc files are memory mapped, parquet files are read into memory
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+        format = json.load(file)["format"]
+    path = os.path.join(directory, name + SNAPSHOT_FORMATS[format])
+    if format == "arrow":
+        return pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+    return pyarrow.parquet.read_table(path, memory_map=True)
@@ -1,36 +1,66 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
+from itertools import cycle
 from types import TracebackType
-from typing import Callable, Optional
+from typing import AsyncIterator, Callable, Iterator, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from typing_extensions import Self
 
 from ..config import settings
 from ..port.unit_of_work import IUnitOfWork
-from .repository import BookRepository, PublisherRepository
+from .cache import IdentityCache
+from .engine import PoolMetrics, build_engine, is_sqlite_wal
+from .repository import BookRepository, OperationRepository, PublisherRepository
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    future=True,
-    echo=True,  # FIXME
-    # isolation_level="REPEATABLE READ",  # FIXME
+pool_metrics = PoolMetrics()
+engine = build_engine(settings.DATABASE_URL, settings, pool_metrics)
+reader_engines = [
+    build_engine(url, settings, pool_metrics) for url in settings.DATABASE_READER_URLS
+]
+# without replicas, a WAL database serves reads from query_only connections on the
+# same file, which run beside the single writer connection
+local_reader_engines = (
+    [build_engine(settings.DATABASE_URL, settings, pool_metrics, readonly=True)]
+    if not reader_engines and is_sqlite_wal(settings.DATABASE_URL, settings)
+    else []
+)
+identity_cache = (
+    IdentityCache(settings.REPOSITORY_CACHE_SIZE, settings.REPOSITORY_CACHE_TTL)
+    if settings.REPOSITORY_CACHE_SIZE
+    else None
 )
 
 Session: Callable[[], AsyncSession] = sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)  # type: ignore
+ReaderSessions: Iterator[Callable[[], AsyncSession]] = cycle(
+    [
+        sessionmaker(bind=reader, expire_on_commit=False, class_=AsyncSession)
+        for reader in reader_engines or local_reader_engines
+    ]
+    or [Session]  # type: ignore
+)
 
 
 @dataclass
 class UnitOfWork(IUnitOfWork):
 
+    readonly: bool = False
     _session: AsyncSession = field(init=False)
+    _depth: int = field(init=False, default=0)
     books: BookRepository = field(init=False)
     publishers: PublisherRepository = field(init=False)
+    operations: OperationRepository = field(init=False)
 
     async def __aenter__(self) -> Self:
-        self._session = await Session().__aenter__()
-        self.books = BookRepository(self._session)
-        self.publishers = PublisherRepository(self._session)
+        if self._depth == 0:
+            make_session = next(ReaderSessions) if self.readonly else Session
+            self._session = await make_session().__aenter__()
+            self.books = BookRepository(self._session, identity_cache)
+            self.publishers = PublisherRepository(self._session, identity_cache)
+            self.operations = OperationRepository(self._session)
+        self._depth += 1
         return self
 
     async def __aexit__(
@@ -39,10 +69,36 @@ class UnitOfWork(IUnitOfWork):
         exc_value: Optional[BaseException],
         traceback: Optional[TracebackType],
     ) -> None:
-        await self._session.__aexit__(exc_type, exc_value, traceback)
+        self._depth -= 1
+        if self._depth == 0:
+            await self._session.__aexit__(exc_type, exc_value, traceback)
 
     async def commit(self) -> None:
+        if self.readonly:
+            raise RuntimeError("read-only unit of work can not commit.")
         await self._session.commit()
 
     async def rollback(self) -> None:
         await self._session.rollback()
+
+
+_scoped_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "scoped_unit_of_work", default=None
+)
+
+
+def unit_of_work() -> UnitOfWork:
+    # nested `async with` share the scoped session, which is closed by the outermost one.
+    # only the command a request starts directly sees the scope, domino starts touched,
+    # retried and coalesced blocks in an empty context, so they open their own session.
+    return _scoped_unit_of_work.get() or UnitOfWork()
+
+
+@asynccontextmanager
+async def scoped_unit_of_work(readonly: bool = False) -> AsyncIterator[UnitOfWork]:
+    async with UnitOfWork(readonly=readonly) as uow:
+        token = _scoped_unit_of_work.set(uow)
+        try:
+            yield uow
+        finally:
+            _scoped_unit_of_work.reset(token)
@@ -1,7 +1,16 @@
+from operator import attrgetter
+from typing import Callable
+
+from domino.coalesce import Merge
 from domino.domino import Domino
+from domino.idempotency import IdempotencyStore
+from domino.retry import Retry
+from domino.scheduler import Priority
+from domino.transport import Transport
 
 from .adapter.email_sender import FakeEmailSender
 from .adapter.orm import start_mappers
+from .port.cache import IIdentityCache
 from .port.email_sender import IEmailSender
 from .port.unit_of_work import IUnitOfWork
 from .service.actions import commands as cmd_actions
@@ -15,27 +24,80 @@ from .service.blocks import events as evt_blocks
 def bootstrap(
     *,
     start_orm_mapper: bool,
-    Uow: type[IUnitOfWork],
-    email_sender: IEmailSender = FakeEmailSender()
+    Uow: Callable[[], IUnitOfWork],
+    email_sender: IEmailSender = FakeEmailSender(),
+    transport: Transport | None = None,
+    idempotency: IdempotencyStore | None = None,
+    cache: IIdentityCache | None = None,
+    import_chunk_size: int = 1000,
+    import_workers: int = 4,
+    import_lease_seconds: float = 60.0,
+    import_max_attempts: int = 3,
 ) -> Domino:
     if start_orm_mapper:
         start_mappers()
 
     # Domino
-    domino = Domino()
+    domino = Domino(idempotency=idempotency)
     # Commands
     domino.place(
         cmd_blocks.CreatePublisher, cmd_actions.create_publisher, Uow=Uow
     )
     domino.place(cmd_blocks.CreateBook, cmd_actions.create_book, Uow=Uow)
+    domino.place(cmd_blocks.CreateBooks, cmd_actions.create_books, Uow=Uow)
     domino.place(cmd_blocks.DeleteBook, cmd_actions.delete_book, Uow=Uow)
+    domino.place(cmd_blocks.DeleteBooks, cmd_actions.delete_books, Uow=Uow)
+    domino.place(
+        cmd_blocks.CreateBooksImport, cmd_actions.create_books_import, Uow=Uow
+    )
+    domino.place(
+        cmd_blocks.RunBooksImport,
+        cmd_actions.run_books_import,
+        Uow=Uow,
+        chunk_size=import_chunk_size,
+        workers=import_workers,
+        lease_seconds=import_lease_seconds,
+        max_attempts=import_max_attempts,
+    )
+    domino.place(cmd_blocks.CancelOperation, cmd_actions.cancel_operation, Uow=Uow)
     # Events
     domino.place(evt_blocks.PublisherCreated, evt_actions.publisher_created)
-    domino.place(evt_blocks.BookCreated, evt_actions.book_created)
-    domino.place(evt_blocks.BookDeleted, evt_actions.book_deleted)
+    domino.place(evt_blocks.BookCreated, evt_actions.book_created, cache=cache)
+    domino.place(evt_blocks.BooksCreated, evt_actions.books_created, cache=cache)
+    domino.place(evt_blocks.BookDeleted, evt_actions.book_deleted, cache=cache)
+    domino.place(evt_blocks.BooksDeleted, evt_actions.books_deleted, cache=cache)
     # Effects
     domino.place(
         eft_blokcs.SendMail, eft_actions.send_mail, email_sender=email_sender
     )
 
+    # Priorities
+    for block_type in (
+        cmd_blocks.CreatePublisher,
+        cmd_blocks.CreateBook,
+        cmd_blocks.CreateBooks,
+        cmd_blocks.DeleteBook,
+        cmd_blocks.DeleteBooks,
+        cmd_blocks.CreateBooksImport,
+        cmd_blocks.CancelOperation,
+    ):
+        domino.prioritize(block_type, Priority.HIGH)
+    domino.prioritize(eft_blokcs.SendMail, Priority.LOW)
+    # imports are bounded by the operation workers, not by scheduler slots
+    domino.unschedule(cmd_blocks.RunBooksImport)
+
+    # Retries
+    domino.retry(eft_blokcs.SendMail, Retry(max_attempts=5, base_delay=0.5))
+    domino.timeout(eft_blokcs.SendMail, 10.0)
+
+    # Coalescing
+    domino.coalesce(
+        eft_blokcs.SendMail,
+        Merge(eft_actions.merge_send_mails, key=attrgetter("from_", "to")),
+    )
+
+    # Transport
+    if transport:
+        domino.route(eft_blokcs.SendMail, transport)
+
     return domino
@@ -1,8 +1,41 @@
+import os
+import tempfile
+
 from pydantic import BaseSettings as _BaseSettings
 
 
-class _Settings(_BaseSettings):
+class Settings(_BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite://"
+    DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_QUERY_CACHE_SIZE: int = 500
+    DATABASE_UUID_BINARY: bool = False
+    DATABASE_READER_URLS: list[str] = []
+    DATABASE_READER_CREATE_SCHEMA: bool = False
+    DATABASE_READ_YOUR_WRITES_WINDOW: float = 5.0
+    DATABASE_SQLITE_WAL: bool = False
+    DATABASE_SQLITE_SYNCHRONOUS: str = "NORMAL"
+    DATABASE_SQLITE_CACHE_SIZE: int = -65_536
+    DATABASE_SQLITE_MMAP_SIZE: int = 268_435_456
+    DATABASE_SQLITE_BUSY_TIMEOUT: int = 5_000
+    DATABASE_SQLITE_READER_POOL_SIZE: int = 4
+    FAST_RESPONSES: bool = False
+    FULLTEXT_SEARCH: bool = False
+    DOMINO_BROKER_PATH: str | None = None
+    IDEMPOTENCY_CACHE_SIZE: int = 10_000
+    IDEMPOTENCY_DATABASE_PATH: str | None = None
+    REPOSITORY_CACHE_SIZE: int = 0
+    REPOSITORY_CACHE_TTL: float = 60.0
+    OPERATION_WORKERS: int = 2
+    OPERATION_CHUNK_SIZE: int = 1000
+    OPERATION_VALIDATION_WORKERS: int = 4
+    OPERATION_LEASE_SECONDS: float = 60.0
+    OPERATION_MAX_ATTEMPTS: int = 3
+    OPERATION_SPOOL_DIR: str = os.path.join(tempfile.gettempdir(), "operations")
 
 
-settings = _Settings()  # type: ignore
+settings = Settings()  # type: ignore
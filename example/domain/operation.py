@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+
+# google.rpc.Code values an operation can end with
+CANCELLED = 1
+INTERNAL = 13
+
+
+@dataclass(kw_only=True)
+class Operation:
+
+    id: UUID
+    kind: str
+    parent_id: UUID | None
+
+    source_path: str
+    source_format: str
+
+    done: bool = False
+    cancel_requested: bool = False
+    # the run holding the operation, until its lease expires
+    owner: str | None = None
+    lease_expire_time: datetime | None = None
+    # runs that claimed the operation, a run that keeps losing it is given up on
+    attempts: int = 0
+    error_code: int | None = None
+    error_message: str | None = None
+
+    processed_rows: int = 0
+    created_rows: int = 0
+    failed_rows: int = 0
+    failures: list[str] = field(default_factory=list)
+
+    create_time: datetime = field(default_factory=datetime.utcnow)
+    update_time: datetime = field(default_factory=datetime.utcnow)
@@ -0,0 +1,161 @@
+"""Command line entrypoint, sharing the api's settings and database.
+
+    $ DATABASE_URL=sqlite+aiosqlite:///app.db \
+        python -m example.entrypoints.cli import-books books.csv --chunk-size 5000
+    $ DATABASE_URL=sqlite+aiosqlite:///app.db \
+        python -m example.entrypoints.cli export-snapshot snapshots/2 --base snapshots/1
+"""
+import argparse
+import asyncio
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from uuid import UUID
+
+from ..adapter.orm import create_fulltext_index, mapper_registry, start_mappers
+from ..adapter.snapshot import SNAPSHOT_FORMATS, SnapshotReport, export_snapshot
+from ..adapter.unit_of_work import engine, unit_of_work
+from ..config import settings
+from ..service.pipeline import BooksImportPipeline, ImportReport, read_rows
+
+IMPORT_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+async def _create_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(mapper_registry.metadata.create_all)
+        if settings.FULLTEXT_SEARCH:
+            await conn.run_sync(create_fulltext_index)
+
+
+def _print_import_report(report: ImportReport):
+    print(
+        f"rows={report.processed_rows:,} books={report.created_books:,}"
+        f" publishers={report.created_publishers:,} failed={report.failed_rows:,}"
+        f" elapsed={report.seconds:.1f}s"
+        f" ({report.processed_rows / report.seconds if report.seconds else 0:,.0f} rows/s)"
+    )
+    for stage in report.stages.values():
+        print(
+            f"  {stage.name:<8} rows={stage.rows:,} busy={stage.seconds:.1f}s"
+            f" {stage.rows_per_second:,.0f} rows/s"
+        )
+    for failure in report.failures:
+        print(f"  {failure}")
+
+
+async def import_books(args: argparse.Namespace) -> int:
+    source_format = args.format or IMPORT_FORMATS.get(
+        os.path.splitext(args.path)[1], None
+    )
+    if source_format is None:
+        print(f"can not tell the format of {args.path}, use --format.")
+        return 2
+    await _create_tables()
+    if args.publisher_id is not None:
+        async with unit_of_work() as uow:
+            if await uow.publishers.get(args.publisher_id) is None:
+                print(f"publisher not found: {args.publisher_id}")
+                return 1
+    executor: Executor | None = (
+        ProcessPoolExecutor(args.workers) if args.processes else None
+    )
+    pipeline = BooksImportPipeline(
+        unit_of_work,
+        publisher_id=args.publisher_id,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        executor=executor,
+    )
+    try:
+        with open(args.path, newline="", encoding="utf-8") as file:
+            report = await pipeline.run(read_rows(file, source_format))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        await engine.dispose()
+    _print_import_report(report)
+    return 0
+
+
+def _print_snapshot_report(report: SnapshotReport):
+    print(
+        f"format={report.format} base={report.base or '-'}"
+        f" elapsed={report.seconds:.1f}s"
+    )
+    for table in report.tables.values():
+        print(
+            f"  {table.name:<10} rows={table.rows:,} exported={table.exported_rows:,}"
+            f" deleted={table.deleted_rows:,} busy={table.seconds:.1f}s"
+        )
+
+
+async def export_catalog_snapshot(args: argparse.Namespace) -> int:
+    try:
+        report = await export_snapshot(
+            engine,
+            args.directory,
+            format=args.format,
+            base=args.base,
+            batch_size=args.batch_size,
+        )
+    finally:
+        await engine.dispose()
+    _print_snapshot_report(report)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m example.entrypoints.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser(
+        "import-books",
+        help="import books from a csv or ndjson file in chunked transactions.",
+    )
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=sorted(set(IMPORT_FORMATS.values())))
+    importer.add_argument(
+        "--publisher-id",
+        type=UUID,
+        help="import every row into this publisher, otherwise rows carry"
+        " publisher_id or publisher_title.",
+    )
+    importer.add_argument(
+        "--chunk-size", type=int, default=settings.OPERATION_CHUNK_SIZE
+    )
+    importer.add_argument("--batch-size", type=int, default=250)
+    importer.add_argument(
+        "--workers", type=int, default=settings.OPERATION_VALIDATION_WORKERS
+    )
+    importer.add_argument("--queue-size", type=int, default=8)
+    importer.add_argument(
+        "--processes",
+        action="store_true",
+        help="validate in a process pool instead of a thread pool.",
+    )
+    importer.set_defaults(run=import_books)
+
+    exporter = commands.add_parser(
+        "export-snapshot",
+        help="export publishers and books from one consistent read into a directory"
+        " (needs pyarrow: pip install 'fastapi_aip_example[snapshot]').",
+    )
+    exporter.add_argument("directory")
+    exporter.add_argument("--format", choices=list(SNAPSHOT_FORMATS), default="parquet")
+    exporter.add_argument(
+        "--base",
+        help="a previous snapshot directory, only rows changed since it are exported.",
+    )
+    exporter.add_argument("--batch-size", type=int, default=50_000)
+    exporter.set_defaults(run=export_catalog_snapshot)
+
+    args = parser.parse_args(argv)
+    start_mappers()
+    return asyncio.run(args.run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
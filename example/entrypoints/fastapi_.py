@@ -1,27 +1,94 @@
 import asyncio
+import json
+import os
+import re
+import time
 from datetime import datetime
-from typing import Any, Literal
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, AsyncIterator, Callable, Literal
 from uuid import UUID, uuid4
 
+from aip.etag import build_etag, match_etag
+from aip.field_mask import parse_field_mask
 from aip.filter import Converter as FilterConverter
+from aip.index import uncovered_keys
 from aip.order_by import Converter as OrderByConverter
 from aip.page import Cursor, PageToken, get_page_clause
-from fastapi import FastAPI, Response, status
-from pydantic import BaseModel, Field
-from sqlalchemy import and_, desc, not_, or_, select
-
-from ..adapter.unit_of_work import UnitOfWork
+from domino.action import run_in_threadpool
+from domino.idempotency import IdempotencyStore
+from domino.transport import Serializer, SqliteBroker, Transport
+from domino.worker import WorkerPool
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import BaseModel, Field, create_model
+from sqlalchemy import and_, desc, not_, or_, select, tuple_
+
+from ..adapter.orm import FULLTEXT_COLUMNS, FULLTEXT_MIN_LENGTH, fulltext_contains
+from ..adapter.unit_of_work import (
+    UnitOfWork,
+    engine,
+    identity_cache,
+    pool_metrics,
+    reader_engines,
+    scoped_unit_of_work,
+    unit_of_work,
+)
 from ..bootstrap import bootstrap
+from ..config import settings
 from ..domain.book import Book
+from ..domain.operation import Operation
 from ..domain.publisher import Publisher
 from ..service.blocks import commands as blocks
+from ..service.blocks import effects as eft_blocks
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 
 app = FastAPI(
     title="FastAPI AIP Example",
     description="Google에서 공개한 [AIP](https://google.aip.dev/)에 등장하는 API 설계 패턴들을 FastAPI를 통해 구현한 예제입니다.",
 )
-domino = bootstrap(start_orm_mapper=True, Uow=UnitOfWork)
+transport = (
+    Transport(
+        SqliteBroker(settings.DOMINO_BROKER_PATH),
+        Serializer([eft_blocks.SendMail]),
+    )
+    if settings.DOMINO_BROKER_PATH
+    else None
+)
+domino = bootstrap(
+    start_orm_mapper=True,
+    Uow=unit_of_work,
+    transport=transport,
+    idempotency=IdempotencyStore(
+        maxsize=settings.IDEMPOTENCY_CACHE_SIZE,
+        path=settings.IDEMPOTENCY_DATABASE_PATH,
+    ),
+    cache=identity_cache,
+    import_chunk_size=settings.OPERATION_CHUNK_SIZE,
+    import_workers=settings.OPERATION_VALIDATION_WORKERS,
+    import_lease_seconds=settings.OPERATION_LEASE_SECONDS,
+    import_max_attempts=settings.OPERATION_MAX_ATTEMPTS,
+)
+background_tasks: set[asyncio.Task[None]] = set()
+operation_workers: WorkerPool[UUID] = WorkerPool(
+    lambda operation_id: domino.start(blocks.RunBooksImport(id=operation_id)),
+    size=settings.OPERATION_WORKERS,
+)
 
 
 async def create_test_resource():
@@ -122,17 +189,67 @@ async def create_test_resource():
     await asyncio.gather(*(domino.start(block) for block in create_book_blocks))
 
 
+async def resume_operations():
+    # unfinished operations without a live lease resume where they stopped, those of a
+    # previous process and those of a worker that died holding one. every run claims
+    # the operation first, so submitting one that is already running does nothing.
+    while True:
+        async with UnitOfWork() as uow:
+            unclaimed = await uow.operations.query_rows(
+                select(Operation.id).where(
+                    not_(Operation.done),
+                    or_(
+                        Operation.owner.is_(None),  # type: ignore
+                        Operation.lease_expire_time < datetime.utcnow(),  # type: ignore
+                    ),
+                )
+            )
+        for row in unclaimed:
+            operation_workers.submit(row.id)
+        await asyncio.sleep(settings.OPERATION_LEASE_SECONDS)
+
+
 @app.on_event("startup")  # type: ignore
 async def startup():
-    from ..adapter.orm import mapper_registry
-    from ..adapter.unit_of_work import engine
-
-    async with engine.connect() as conn:
-        await conn.run_sync(mapper_registry.metadata.create_all)
-        await conn.commit()
+    from ..adapter.orm import book_table, create_fulltext_index, mapper_registry
+
+    # replicas get their schema through replication, a local setup whose readers are
+    # separate databases asks for it with DATABASE_READER_CREATE_SCHEMA
+    binds = (
+        [engine, *reader_engines]
+        if settings.DATABASE_READER_CREATE_SCHEMA
+        else [engine]
+    )
+    for bind in binds:
+        async with bind.connect() as conn:
+            await conn.run_sync(mapper_registry.metadata.create_all)
+            if settings.FULLTEXT_SEARCH:
+                await conn.run_sync(create_fulltext_index)
+            await conn.commit()
 
     await create_test_resource()
 
+    operation_workers.start()
+    background_tasks.add(asyncio.create_task(resume_operations()))
+
+    for key in uncovered_keys(
+        [[column.name for column in index.columns] for index in book_table.indexes],
+        BOOK_FILTER_FIELDS,
+        BOOK_ORDER_BY_FIELDS,
+    ):
+        logger.warning(f"no index on books covers ({', '.join(key)}).")
+
+    if transport:
+        background_tasks.add(asyncio.create_task(domino.consume(transport)))
+
+
+@app.on_event("shutdown")  # type: ignore
+async def shutdown():
+    await operation_workers.stop()
+    await domino.flush()
+    for task in background_tasks:
+        task.cancel()
+
 
 # =========================================================
 # Global
@@ -141,6 +258,205 @@ WILDCARD_COLLECTION_ID = "-"
 WILDCARD_COLLECTION_ID_TYPE = Literal["-"]
 
 
+READ_YOUR_WRITES_COOKIE = "read_your_writes_until"
+
+
+def scoped_request_id(parent: str, request_id: str | None) -> str | None:
+    # request ids are unique within a parent, the same one under another parent
+    # is a different request
+    return None if request_id is None else f"{parent}/{request_id}"
+
+
+async def get_unit_of_work(response: Response) -> AsyncIterator[UnitOfWork]:
+    if reader_engines:
+        # reads from this client go to the writer until replicas have caught up.
+        window = settings.DATABASE_READ_YOUR_WRITES_WINDOW
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(time.time() + window),
+            max_age=int(window) + 1,
+            httponly=True,
+        )
+    async with scoped_unit_of_work() as uow:
+        yield uow
+
+
+def reads_from_writer(request: Request) -> bool:
+    try:
+        return float(request.cookies[READ_YOUR_WRITES_COOKIE]) > time.time()
+    except (KeyError, ValueError):
+        return False
+
+
+async def get_reader_unit_of_work(request: Request) -> AsyncIterator[UnitOfWork]:
+    async with scoped_unit_of_work(readonly=not reads_from_writer(request)) as uow:
+        yield uow
+
+
+def parse_read_mask(
+    read_mask: str | None, model: type[BaseModel]
+) -> tuple[str, ...] | None:
+    if read_mask is None:
+        return None
+    try:
+        return tuple(parse_field_mask(read_mask, list(model.__fields__)))
+    except ValueError as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
+
+
+@lru_cache(maxsize=None)
+def partial_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(  # type: ignore
+        f"{model.__name__}[{','.join(fields)}]",
+        **{field: (model.__fields__[field].outer_type_, ...) for field in fields},
+    )
+
+
+def json_response(
+    instance: BaseModel, headers: dict[str, str] | None = None
+) -> Response:
+    return Response(
+        content=instance.json(), media_type="application/json", headers=headers
+    )
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dump_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+@lru_cache(maxsize=None)
+def serializer(
+    model: type[BaseModel], fields: tuple[str, ...] | None = None
+) -> Callable[[Any], dict[str, Any]]:
+    # reads the response fields straight off an entity or a row, no validation
+    keys = fields or tuple(model.__fields__)
+    getter = attrgetter(*keys)
+    if len(keys) == 1:
+        return lambda obj: {keys[0]: getter(obj)}
+    return lambda obj: dict(zip(keys, getter(obj)))
+
+
+def fast_response(content: Any, headers: dict[str, str] | None = None) -> Response:
+    return Response(
+        content=dump_json(content), media_type="application/json", headers=headers
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+@app.get("/metrics", tags=["Metrics"])
+async def get_metrics():
+    """
+    - **database** - 커넥션 풀 checkout 횟수, 사용 중인 커넥션 수(StaticPool일 경우 null), overflow, checkout 대기 시간
+    - **cache** - repository 캐시의 크기와 hit, miss, stale 횟수 (캐시가 비활성화된 경우 null)
+    - **domino** - 우선순위별 대기열 지표, dead letter 수, cascade 제한 위반 횟수
+    - **operations** - operation worker 수, 실행 중 및 대기 중인 operation 수, 완료 및 실패 횟수
+    """
+    return {
+        "database": pool_metrics.snapshot(),
+        "cache": identity_cache.snapshot() if identity_cache else None,
+        "domino": {
+            "queues": domino.scheduler.snapshot(),
+            "dead_letters": len(domino.dead_letters),
+            "cascade_violations": dict(domino.budget.violations),
+        },
+        "operations": operation_workers.snapshot(),
+    }
+
+
+# =========================================================
+# Operation
+# =========================================================
+class OperationError(BaseModel):
+    code: int
+    message: str
+
+
+class ImportBooksMetadata(BaseModel):
+
+    processed_rows: int
+    created_rows: int
+    failed_rows: int
+    failures: list[str]
+    cancel_requested: bool
+
+    create_time: datetime
+    update_time: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class OperationResponse(BaseModel):
+    name: str
+    done: bool
+    metadata: ImportBooksMetadata
+    error: OperationError | None
+
+
+def operation_response(operation: Operation) -> OperationResponse:
+    return OperationResponse(
+        name=f"operations/{operation.id}",
+        done=operation.done,
+        metadata=ImportBooksMetadata.from_orm(operation),
+        error=OperationError(
+            code=operation.error_code, message=operation.error_message or ""
+        )
+        if operation.error_code is not None
+        else None,
+    )
+
+
+# ========== Get ==========
+@app.get(
+    "/operations/{operation_id}",
+    response_model=OperationResponse,
+    tags=["Operation"],
+)
+async def get_operation(
+    operation_id: UUID, uow: UnitOfWork = Depends(get_reader_unit_of_work)
+):
+    """
+    - [**long-running operation**](https://google.aip.dev/151)의 진행 상황을 조회합니다.
+    - **done**이 true일 경우 operation이 종료된 것이며, 실패하거나 취소된 경우 **error**가 포함됩니다.
+    """
+    operation = await uow.operations.get(operation_id)
+    assert operation
+    return operation_response(operation)
+
+
+# ========== Cancel ==========
+@app.post(
+    "/operations/{operation_id}:cancel",
+    response_model=OperationResponse,
+    tags=["Operation"],
+)
+async def cancel_operation(
+    operation_id: UUID, uow: UnitOfWork = Depends(get_unit_of_work)
+):
+    """
+    - 진행 중인 operation의 [**취소**](https://google.aip.dev/151#cancellation)를 요청합니다.
+    - 현재 처리 중인 chunk가 커밋된 뒤 취소되며, 이미 커밋된 books는 유지됩니다.
+    - 이미 종료된 operation은 변경되지 않습니다.
+    """
+    await domino.start(blocks.CancelOperation(id=operation_id))
+    operation = await uow.operations.get(operation_id)
+    assert operation
+    return operation_response(operation)
+
+
 # =========================================================
 # Book
 # =========================================================
@@ -178,6 +494,7 @@ async def list_publishers(
     page_size: int | None,
     page_token: str | None,
     skip: int | None,
+    uow: UnitOfWork = Depends(get_reader_unit_of_work),
 ):
     """
     - 다음 페이지가 존재할 경우 응답에 **next_page_token** 문자열 토큰이 포함됩니다.
@@ -201,8 +518,7 @@ async def list_publishers(
     if offset:
         stat = stat.offset(offset)
 
-    async with UnitOfWork() as uow:
-        publishers = await uow.publishers.query(stat)
+    publishers = await uow.publishers.query(stat)
 
     next_page_book = publishers.pop() if len(publishers) > limit else None
     next_page_token = (
@@ -218,6 +534,14 @@ async def list_publishers(
         else ""
     )
 
+    if settings.FAST_RESPONSES:
+        serialize = serializer(PublisherResponse)
+        return fast_response(
+            {
+                "publishers": [serialize(publisher) for publisher in publishers],
+                "next_page_token": next_page_token,
+            }
+        )
     return {"publishers": publishers, "next_page_token": next_page_token}
 
 
@@ -231,11 +555,18 @@ class CreatePublisherRequest(BaseModel):
     response_model=PublisherResponse,
     tags=["Publisher"],
 )
-async def create_publisher(req: CreatePublisherRequest):
-    publisher_id = uuid4()
-    await domino.start(blocks.CreatePublisher(id=publisher_id, title=req.title))
-    async with UnitOfWork() as uow:
-        publisher = await uow.publishers.get(publisher_id)
+async def create_publisher(
+    req: CreatePublisherRequest,
+    request_id: str | None = None,
+    uow: UnitOfWork = Depends(get_unit_of_work),
+):
+    """
+    - [**request_id**](https://google.aip.dev/155)를 지정할 경우 같은 request_id로 재시도된 요청은 다시 실행되지 않고 처음 생성된 리소스를 반환합니다.
+    """
+    publisher_id = await domino.start(
+        blocks.CreatePublisher(id=uuid4(), title=req.title), request_id=request_id
+    )
+    publisher = await uow.publishers.get(publisher_id)
     return PublisherResponse.from_orm(publisher)
 
 
@@ -246,10 +577,31 @@ async def create_publisher(req: CreatePublisherRequest):
     response_model=PublisherResponse,
     tags=["Publisher"],
 )
-async def get_publisher(publisher_id: UUID):
-    async with UnitOfWork() as uow:
-        publisher = await uow.publishers.get(publisher_id)
+async def get_publisher(
+    publisher_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    uow: UnitOfWork = Depends(get_reader_unit_of_work),
+):
+    """
+    - 응답의 **ETag**를 If-None-Match 헤더로 전달할 경우, 변경되지 않았다면 304를 응답합니다.
+    """
+    if if_none_match:
+        rows = await uow.publishers.query_rows(
+            select(Publisher._version_number).where(Publisher.id == publisher_id)
+        )
+        assert rows
+        etag = build_etag(publisher_id, rows[0]._version_number)
+        if match_etag(if_none_match, etag):
+            return not_modified(etag)
+    publisher = await uow.publishers.get(publisher_id)
     assert publisher
+    etag = build_etag(publisher.id, publisher._version_number)
+    if settings.FAST_RESPONSES:
+        return fast_response(
+            serializer(PublisherResponse)(publisher), headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
     return publisher
 
 
@@ -273,6 +625,15 @@ class ListBooksResponse(BaseModel):
     next_page_token: str
 
 
+@lru_cache(maxsize=None)
+def partial_list_books_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(  # type: ignore
+        f"ListBooksResponse[{','.join(fields)}]",
+        books=(list[partial_model(BookResponse, fields)], ...),  # type: ignore
+        next_page_token=(str, ...),
+    )
+
+
 # ========== Craete ==========
 class CreateBookRequest(BaseModel):
     title: str
@@ -284,30 +645,222 @@ class CreateBookRequest(BaseModel):
     response_model=BookResponse,
     tags=["Book"],
 )
-async def create_book(publisher_id: UUID, req: CreateBookRequest):
-    async with UnitOfWork() as uow:
-        assert await uow.publishers.get(publisher_id)
-    book_id = uuid4()
-    await domino.start(
+async def create_book(
+    publisher_id: UUID,
+    req: CreateBookRequest,
+    request_id: str | None = None,
+    uow: UnitOfWork = Depends(get_unit_of_work),
+):
+    """
+    - [**request_id**](https://google.aip.dev/155)를 지정할 경우 같은 request_id로 재시도된 요청은 다시 실행되지 않고 처음 생성된 리소스를 반환합니다.
+    """
+    assert await uow.publishers.get(publisher_id)
+    book_id = await domino.start(
         blocks.CreateBook(
-            id=book_id,
+            id=uuid4(),
             publisher_id=publisher_id,
             title=req.title,
             author_name=req.author_name,
         ),
+        request_id=scoped_request_id(f"publishers/{publisher_id}", request_id),
     )
-    async with UnitOfWork() as uow:
-        book = await uow.books.get(book_id)
+    book = await uow.books.get(book_id)
     assert book
     return BookResponse.from_orm(book)
 
 
+# ========== Batch Create ==========
+PUBLISHER_NAME_PATTERN = re.compile(r"publishers/(?P<publisher_id>[^/]+)")
+MAX_BATCH_CREATE_SIZE = 1000
+
+
+class BatchCreateBookRequest(BaseModel):
+    parent: str | None = None
+    book: CreateBookRequest
+
+
+class BatchCreateBooksRequest(BaseModel):
+    requests: list[BatchCreateBookRequest]
+
+
+class BatchCreateBooksResponse(BaseModel):
+    books: list[BookResponse]
+
+
+def parse_parent(
+    parent: str | None, publisher_id: UUID | WILDCARD_COLLECTION_ID_TYPE
+) -> UUID:
+    match = PUBLISHER_NAME_PATTERN.fullmatch(parent) if parent else None
+    try:
+        if publisher_id != WILDCARD_COLLECTION_ID:
+            assert match is None or match["publisher_id"] == str(publisher_id)
+            return publisher_id
+        assert match
+        return UUID(match["publisher_id"])
+    except (AssertionError, ValueError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, f"invalid parent: {parent}")
+
+
+@app.post(
+    "/publishers/{publisher_id}/books:batchCreate",
+    response_model=BatchCreateBooksResponse,
+    tags=["Book"],
+)
+async def batch_create_books(
+    publisher_id: UUID | WILDCARD_COLLECTION_ID_TYPE,
+    req: BatchCreateBooksRequest,
+    request_id: str | None = None,
+    uow: UnitOfWork = Depends(get_unit_of_work),
+):
+    """
+    - [**requests**](https://google.aip.dev/233)의 books를 하나의 트랜잭션으로 생성하며, 하나라도 실패할 경우 아무것도 생성되지 않습니다.
+    - publisher_id를 collection wildcard id인 "-"로 지정할 경우 각 요청의 **parent**(publishers/{publisher_id})를 지정해야 합니다.
+    - 한 번에 최대 1000개의 books를 생성할 수 있습니다.
+    - [**request_id**](https://google.aip.dev/155)를 지정할 경우 같은 request_id로 재시도된 요청은 다시 실행되지 않고 처음 생성된 리소스를 반환합니다.
+    """
+    if len(req.requests) > MAX_BATCH_CREATE_SIZE:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"at most {MAX_BATCH_CREATE_SIZE} books can be created at once.",
+        )
+    cmds = tuple(
+        blocks.CreateBook(
+            id=uuid4(),
+            publisher_id=parse_parent(item.parent, publisher_id),
+            title=item.book.title,
+            author_name=item.book.author_name,
+        )
+        for item in req.requests
+    )
+    publisher_ids = list({cmd.publisher_id for cmd in cmds})
+    found = await uow.publishers.query_rows(
+        select(Publisher.id).where(Publisher.id.in_(publisher_ids))  # type: ignore
+    )
+    missing = set(publisher_ids).difference(row.id for row in found)
+    if missing:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            f"publishers not found: {', '.join(map(str, missing))}",
+        )
+    book_ids = await domino.start(
+        blocks.CreateBooks(books=cmds),
+        request_id=scoped_request_id(f"publishers/{publisher_id}", request_id),
+    )
+    if book_ids != [cmd.id for cmd in cmds]:
+        # a retried request returns the books its first attempt created
+        return {"books": await uow.books.get_many(book_ids)}
+    return {
+        "books": [
+            BookResponse(
+                id=cmd.id,
+                publisher_id=cmd.publisher_id,
+                title=cmd.title,
+                author_name=cmd.author_name,
+            )
+            for cmd in cmds
+        ]
+    }
+
+
+# ========== Import ==========
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@app.post(
+    "/publishers/{publisher_id}/books:import",
+    response_model=OperationResponse,
+    tags=["Book"],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                content_type: {"schema": {"type": "string", "format": "binary"}}
+                for content_type in IMPORT_FORMATS
+            },
+            "required": True,
+        }
+    },
+)
+async def import_books(
+    publisher_id: UUID | WILDCARD_COLLECTION_ID_TYPE,
+    request: Request,
+    uow: UnitOfWork = Depends(get_unit_of_work),
+):
+    """
+    - 요청 본문의 CSV(text/csv) 또는 NDJSON(application/x-ndjson) books를 가져오는 [**long-running operation**](https://google.aip.dev/151)을 시작하고 즉시 응답합니다.
+    - 각 행은 title, author_name을 가져야 합니다.
+    - publisher_id를 collection wildcard id인 "-"로 지정할 경우 각 행은 publisher_id 또는 publisher_title을 가져야 합니다.
+        - 같은 publisher_title을 가진 행들은 하나의 publisher에 속하며, 같은 title의 publisher가 없을 경우 생성됩니다.
+    - 진행 상황과 결과는 GET /operations/{operation_id}로 조회할 수 있습니다.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    source_format = IMPORT_FORMATS.get(content_type, None)
+    if source_format is None:
+        raise HTTPException(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            f"content type must be one of {', '.join(IMPORT_FORMATS)}.",
+        )
+    parent_id = publisher_id if publisher_id != WILDCARD_COLLECTION_ID else None
+    if parent_id is not None:
+        found = await uow.publishers.query_rows(
+            select(Publisher.id).where(Publisher.id == parent_id)
+        )
+        if not found:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND, f"publisher not found: {parent_id}"
+            )
+        # ends the read transaction, the connection goes back to the pool for the
+        # upload instead of being held until the whole body is spooled
+        await uow.rollback()
+
+    # the body is spooled to disk, workers read it after the response is sent
+    operation_id = uuid4()
+    os.makedirs(settings.OPERATION_SPOOL_DIR, exist_ok=True)
+    source_path = os.path.join(
+        settings.OPERATION_SPOOL_DIR, f"{operation_id}.{source_format}"
+    )
+    try:
+        with open(source_path, "wb") as file:
+            async for chunk in request.stream():
+                await run_in_threadpool(file.write, chunk)
+    except BaseException:
+        # a disconnected or cancelled upload leaves no operation to remove it later
+        if os.path.exists(source_path):
+            os.remove(source_path)
+        raise
+
+    await domino.start(
+        blocks.CreateBooksImport(
+            id=operation_id,
+            publisher_id=parent_id,
+            source_path=source_path,
+            source_format=source_format,
+        )
+    )
+    operation_workers.submit(operation_id)
+    operation = await uow.operations.get(operation_id)
+    assert operation
+    return operation_response(operation)
+
+
 # ========== Search ==========
 DEFAULT_PAGE_SIZE = 30
 DEFAULT_ORDER_BY = [Book.title]
+BOOK_FILTER_FIELDS = ["publisher_id", "title", "author_name"]
+BOOK_ORDER_BY_FIELDS = ["title", "author_name"]
 
 
 def contains(c: Any, v: str):
+    if (
+        settings.FULLTEXT_SEARCH
+        and engine.dialect.name == "sqlite"
+        and getattr(c, "key", None) in FULLTEXT_COLUMNS
+        and len(v) >= FULLTEXT_MIN_LENGTH
+    ):
+        return fulltext_contains(c.key, v)
     return c.contains(v)
 
 
@@ -345,6 +898,8 @@ async def search_books(
     page_size: int | None = None,
     page_token: str | None = None,
     skip: int | None = None,
+    read_mask: str | None = None,
+    uow: UnitOfWork = Depends(get_reader_unit_of_work),
 ):
     """
     - **publisher_id**를 지정할 경우 해당 퍼블리셔의 book들로 응답을 제한합니다.
@@ -370,7 +925,12 @@ async def search_books(
     - 다음 페이지가 존재할 경우 응답에 **next_page_token** 문자열 토큰이 포함됩니다.
     - **page_token**에 이전 응답의 next_page_token을 입력할 경우 다음 페이지를 반환합니다.
     - **skip**을 입력할 경우 해당 갯수 만큼의 리소스를 skip한 뒤 페이징합니다.
+    - [**read_mask**](https://google.aip.dev/157)를 지정할 경우 해당 필드들만 조회하여 응답합니다.
+        - 예제
+            - id,title
+            - \*
     """
+    fields = parse_read_mask(read_mask, BookResponse)
     token = None
     if page_token:
         token = PageToken[BookCursor].decode(page_token)
@@ -389,8 +949,16 @@ async def search_books(
     page_clause = get_page_clause(order_by_clauses, token.cursor) if token else None
     limit = page_size if page_size else DEFAULT_PAGE_SIZE
     offset = skip if skip else None
-
-    stat = select(Book)
+    if fields is None and settings.FAST_RESPONSES:
+        # rows are encoded as they are fetched, no entity is hydrated
+        fields = tuple(BookResponse.__fields__)
+
+    if fields is None:
+        stat = select(Book)
+    else:
+        # columns only, the page cursor needs title and author_name even if masked
+        columns = dict.fromkeys((*fields, *BookCursor.__fields__))
+        stat = select(*(getattr(Book, column) for column in columns))
     if publisher_clause is not None:
         stat = stat.where(publisher_clause)
     if filter_clause is not None:
@@ -403,8 +971,10 @@ async def search_books(
     if offset:
         stat = stat.offset(offset)
 
-    async with UnitOfWork() as uow:
+    if fields is None:
         books = await uow.books.query(stat)
+    else:
+        books = await uow.books.query_rows(stat)
 
     next_page_book = books.pop() if len(books) > limit else None
     next_page_token = (
@@ -420,7 +990,72 @@ async def search_books(
         else ""
     )
 
-    return {"books": books, "next_page_token": next_page_token}
+    if settings.FAST_RESPONSES:
+        serialize = serializer(BookResponse, fields)
+        return fast_response(
+            {
+                "books": [serialize(book) for book in books],
+                "next_page_token": next_page_token,
+            }
+        )
+    if fields is None:
+        return {"books": books, "next_page_token": next_page_token}
+    PartialBookResponse = partial_model(BookResponse, fields)
+    return json_response(
+        partial_list_books_model(fields).construct(
+            books=[
+                PartialBookResponse.construct(
+                    **{field: row._mapping[field] for field in fields}
+                )
+                for row in books
+            ],
+            next_page_token=next_page_token,
+        )
+    )
+
+
+# ========== Export ==========
+EXPORT_CHUNK_SIZE = 1000
+
+
+@app.get(
+    "/publishers/{publisher_id}/books:export",
+    response_class=StreamingResponse,
+    tags=["Book"],
+)
+async def export_books(
+    request: Request,
+    publisher_id: UUID | WILDCARD_COLLECTION_ID_TYPE,
+    filter: str | None = None,
+    order_by: str | None = None,
+    read_mask: str | None = None,
+):
+    """
+    - 조건에 맞는 모든 books를 페이징 없이 한 줄에 하나씩 [NDJSON](http://ndjson.org/) 형식으로 스트리밍합니다.
+    - **publisher_id**, **filter**, **order_by**, **read_mask**는 books:search와 동일하게 사용할 수 있습니다.
+    """
+    fields = parse_read_mask(read_mask, BookResponse) or tuple(BookResponse.__fields__)
+    stat = select(*(getattr(Book, field) for field in fields))
+    if publisher_id != WILDCARD_COLLECTION_ID:
+        stat = stat.where(Book.publisher_id == publisher_id)
+    if filter:
+        stat = stat.where(filter_converter.convert(filter))
+    stat = stat.order_by(
+        *(order_by_converter.convert(order_by) if order_by else DEFAULT_ORDER_BY)
+    )
+    readonly = not reads_from_writer(request)
+
+    # the session lives as long as the stream, not the request handler
+    async def lines() -> AsyncIterator[str]:
+        async with UnitOfWork(readonly=readonly) as uow:
+            async for rows in uow.books.stream_rows(stat, EXPORT_CHUNK_SIZE):
+                yield "".join(
+                    json.dumps(dict(zip(fields, row)), default=str, ensure_ascii=False)
+                    + "\n"
+                    for row in rows
+                )
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 # ========== Get ==========
@@ -433,18 +1068,123 @@ async def search_books(
 async def get_book(
     publisher_id: UUID | Literal[WILDCARD_COLLECTION_ID_TYPE],
     book_id: UUID,
+    response: Response,
+    read_mask: str | None = None,
+    if_none_match: str | None = Header(None),
+    uow: UnitOfWork = Depends(get_reader_unit_of_work),
 ):
     """
     - publisher_id는 **collection wildcard id**인 "-"를 입력함으로써 생략할 수 있습니다.
+    - [**read_mask**](https://google.aip.dev/157)를 지정할 경우 해당 필드들만 조회하여 응답합니다.
+    - 응답의 **ETag**를 If-None-Match 헤더로 전달할 경우, 변경되지 않았다면 304를 응답합니다.
     """
-    async with UnitOfWork() as uow:
-        book = await uow.books.get(book_id)
-        assert book
+    fields = parse_read_mask(read_mask, BookResponse)
+    if if_none_match:
+        # a version-only select decides 304 before any row is hydrated
+        stat = select(Book._version_number).where(Book.id == book_id)
+        if publisher_id != WILDCARD_COLLECTION_ID:
+            stat = stat.where(Book.publisher_id == publisher_id)
+        rows = await uow.books.query_rows(stat)
+        assert rows
+        etag = build_etag(book_id, rows[0]._version_number, *(fields or ()))
+        if match_etag(if_none_match, etag):
+            return not_modified(etag)
+    if fields is not None or settings.FAST_RESPONSES:
+        columns = fields or tuple(BookResponse.__fields__)
+        stat = select(
+            Book._version_number, *(getattr(Book, column) for column in columns)
+        )
+        stat = stat.where(Book.id == book_id)
         if publisher_id != WILDCARD_COLLECTION_ID:
-            assert book.publisher_id == publisher_id
+            stat = stat.where(Book.publisher_id == publisher_id)
+        rows = await uow.books.query_rows(stat)
+        assert rows
+        version, *values = rows[0]
+        headers = {"ETag": build_etag(book_id, version, *(fields or ()))}
+        if settings.FAST_RESPONSES:
+            return fast_response(dict(zip(columns, values)), headers=headers)
+        assert fields
+        return json_response(
+            partial_model(BookResponse, fields).construct(**dict(zip(fields, values))),
+            headers=headers,
+        )
+    book = await uow.books.get(book_id)
+    assert book
+    if publisher_id != WILDCARD_COLLECTION_ID:
+        assert book.publisher_id == publisher_id
+    response.headers["ETag"] = build_etag(book.id, book._version_number)
     return book
 
 
+# ========== Batch Get ==========
+BOOK_NAME_PATTERN = re.compile(
+    r"publishers/(?P<publisher_id>[^/]+)/books/(?P<book_id>[^/]+)"
+)
+BATCH_CHUNK_SIZE = 500
+
+
+class BatchGetBooksResponse(BaseModel):
+    books: list[BookResponse]
+
+
+def parse_book_name(
+    name: str, parent_id: UUID | WILDCARD_COLLECTION_ID_TYPE
+) -> tuple[UUID | None, UUID]:
+    match = BOOK_NAME_PATTERN.fullmatch(name)
+    try:
+        assert match
+        publisher_id = match["publisher_id"]
+        if parent_id != WILDCARD_COLLECTION_ID:
+            assert publisher_id in (WILDCARD_COLLECTION_ID, str(parent_id))
+            publisher_id = str(parent_id)
+        return (
+            UUID(publisher_id) if publisher_id != WILDCARD_COLLECTION_ID else None,
+            UUID(match["book_id"]),
+        )
+    except (AssertionError, ValueError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, f"invalid book name: {name}")
+
+
+@app.get(
+    "/publishers/{publisher_id}/books:batchGet",
+    response_model=BatchGetBooksResponse,
+    tags=["Book"],
+)
+async def batch_get_books(
+    publisher_id: UUID | WILDCARD_COLLECTION_ID_TYPE,
+    names: list[str] = Query(...),
+    uow: UnitOfWork = Depends(get_reader_unit_of_work),
+):
+    """
+    - [**names**](https://google.aip.dev/231)로 지정한 books를 한 번의 요청으로 조회하며, 응답은 names의 순서를 따릅니다.
+        - 예제
+            - publishers/{publisher_id}/books/{book_id}
+            - publishers/-/books/{book_id}
+    - publisher_id를 지정할 경우 names는 해당 publisher의 books여야 합니다.
+    - 존재하지 않는 book이 하나라도 있을 경우 404를 응답합니다.
+    """
+    keys = [parse_book_name(name, publisher_id) for name in names]
+    found: dict[UUID, Book] = {}
+    for i in range(0, len(keys), BATCH_CHUNK_SIZE):
+        chunk = keys[i : i + BATCH_CHUNK_SIZE]
+        # the parent check is part of the query, a book of another publisher is missing
+        pairs = [(parent, book_id) for parent, book_id in chunk if parent]
+        ids = [book_id for parent, book_id in chunk if not parent]
+        clauses: list[Any] = []
+        if pairs:
+            clauses.append(tuple_(Book.publisher_id, Book.id).in_(pairs))
+        if ids:
+            clauses.append(Book.id.in_(ids))  # type: ignore
+        books = await uow.books.query(select(Book).where(or_(*clauses)))
+        found.update((book.id, book) for book in books)
+    missing = [name for name, (_, book_id) in zip(names, keys) if book_id not in found]
+    if missing:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND, f"books not found: {', '.join(missing)}"
+        )
+    return {"books": [found[book_id] for _, book_id in keys]}
+
+
 # ========== Delete ==========
 @app.delete(
     "/publishers/{publisher_id}/books/{book_id}",
@@ -452,9 +1192,64 @@ async def get_book(
     response_class=Response,
     tags=["Book"],
 )
-async def delete_book(publisher_id: UUID, book_id: UUID):
-    async with UnitOfWork() as uow:
-        book = await uow.books.get(book_id)
-        assert book
-        assert book.publisher_id == publisher_id
+async def delete_book(
+    publisher_id: UUID, book_id: UUID, uow: UnitOfWork = Depends(get_unit_of_work)
+):
+    book = await uow.books.get(book_id)
+    assert book
+    assert book.publisher_id == publisher_id
     await domino.start(blocks.DeleteBook(id=book_id))
+
+
+# ========== Batch Delete ==========
+class BatchDeleteBooksRequest(BaseModel):
+    names: list[str]
+    all_or_nothing: bool = True
+
+
+class BatchDeleteBookFailure(BaseModel):
+    name: str
+    reason: str
+
+
+class BatchDeleteBooksResponse(BaseModel):
+    deleted: list[str]
+    failures: list[BatchDeleteBookFailure]
+
+
+@app.post(
+    "/publishers/{publisher_id}/books:batchDelete",
+    response_model=BatchDeleteBooksResponse,
+    tags=["Book"],
+)
+async def batch_delete_books(
+    publisher_id: UUID | WILDCARD_COLLECTION_ID_TYPE,
+    req: BatchDeleteBooksRequest,
+    request_id: str | None = None,
+    uow: UnitOfWork = Depends(get_unit_of_work),
+):
+    """
+    - [**names**](https://google.aip.dev/235)로 지정한 books를 하나의 트랜잭션으로 삭제합니다.
+    - publisher_id를 지정할 경우 names는 해당 publisher의 books여야 합니다.
+    - **all_or_nothing**이 true(기본값)일 경우 하나라도 삭제할 수 없다면 아무것도 삭제하지 않고 404를 응답합니다.
+    - all_or_nothing이 false일 경우 삭제할 수 있는 books만 삭제하고, 삭제하지 못한 books를 **failures**로 응답합니다.
+    """
+    keys = [parse_book_name(name, publisher_id) for name in req.names]
+    deleted_ids, failures = await domino.start(
+        blocks.DeleteBooks(books=tuple(keys), all_or_nothing=req.all_or_nothing),
+        request_id=scoped_request_id(f"publishers/{publisher_id}", request_id),
+    )
+    names = {book_id: name for name, (_, book_id) in zip(req.names, keys)}
+    failed = [
+        BatchDeleteBookFailure(name=names[book_id], reason=reason)
+        for book_id, reason in failures.items()
+    ]
+    if failed and req.all_or_nothing:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            [failure.dict() for failure in failed],
+        )
+    return {
+        "deleted": [names[book_id] for book_id in deleted_ids],
+        "failures": failed,
+    }
@@ -0,0 +1,58 @@
+"""Rewrite CHAR(32) hex uuid columns as BINARY(16).
+
+    $ DATABASE_URL=sqlite+aiosqlite:///app.db DATABASE_UUID_BINARY=true \
+        python -m example.migrations.uuid_to_binary
+"""
+import asyncio
+
+from sqlalchemy import Table, column, select, table
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from ..adapter.orm import Uuid, create_fulltext_index, mapper_registry
+from ..config import settings
+
+CHUNK_SIZE = 10_000
+
+
+def _migrate_table(conn: Connection, new: Table):
+    old_name = f"_{new.name}_char_uuid"
+    conn.exec_driver_sql(f'ALTER TABLE "{new.name}" RENAME TO "{old_name}"')
+    for index in new.indexes:
+        conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index.name}"')
+    new.create(conn)
+    # old rows are read through the new table's types, only uuids still hold hex,
+    # so datetimes, json and the rest come back as the values the insert expects
+    old = table(
+        old_name,
+        *(
+            column(c.name, Uuid() if isinstance(c.type, Uuid) else c.type)
+            for c in new.columns
+        ),
+    )
+    rows = conn.execute(select(old)).mappings()
+    while chunk := rows.fetchmany(CHUNK_SIZE):
+        conn.execute(new.insert(), [dict(row) for row in chunk])
+    conn.exec_driver_sql(f'DROP TABLE "{old_name}"')
+
+
+def migrate(conn: Connection):
+    for new in mapper_registry.metadata.sorted_tables:
+        if conn.dialect.has_table(conn, new.name):
+            _migrate_table(conn, new)
+    if settings.FULLTEXT_SEARCH:
+        # the triggers went away with the old books table
+        create_fulltext_index(conn, rebuild=True)
+
+
+async def main():
+    assert settings.DATABASE_UUID_BINARY, "set DATABASE_UUID_BINARY to migrate to."
+    engine = create_async_engine(settings.DATABASE_URL, future=True)
+    assert engine.dialect.name != "postgresql", "postgresql stores native uuids."
+    async with engine.begin() as conn:
+        await conn.run_sync(migrate)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,6 @@
+from typing import Any, Protocol
+
+
+class IIdentityCache(Protocol):
+    def invalidate(self, entity_type: type[Any], entity_id: Any) -> None:
+        ...
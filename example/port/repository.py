@@ -1,9 +1,12 @@
-from typing import Optional, Protocol, TypeVar
+from datetime import datetime
+from typing import AsyncIterator, Optional, Protocol, Sequence, TypeVar
 from uuid import UUID
 
+from sqlalchemy.engine import Row
 from sqlalchemy.sql.selectable import Select
 
 from ..domain.book import Book
+from ..domain.operation import Operation
 from ..domain.publisher import Publisher
 
 A = TypeVar("A")
@@ -15,29 +18,72 @@ class ICollectionOrientedRepository(Protocol[A, I_contra, Q_contra]):
     async def add(self, _aggregate: A) -> None:
         ...
 
+    async def add_many(self, _aggregates: Sequence[A]) -> None:
+        ...
+
     async def get(self, _id: I_contra) -> Optional[A]:
         ...
 
+    async def get_many(self, _ids: Sequence[I_contra]) -> list[A]:
+        ...
+
     async def query(self, select: Q_contra) -> list[A]:
         ...
 
+    async def query_rows(self, select: Q_contra) -> list[Row]:
+        ...
+
+    def stream_rows(
+        self, select: Q_contra, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        ...
+
     async def delete(self, _aggregate: A) -> None:
         ...
 
+    async def delete_many(self, _ids: Sequence[I_contra]) -> int:
+        ...
+
 
 class IPersistenceOrientedRepository(Protocol[A, I_contra, Q_contra]):
     async def save(self, _aggregate: A) -> None:
         ...
 
+    async def save_many(self, _aggregates: Sequence[A]) -> None:
+        ...
+
     async def get(self, _id: I_contra) -> Optional[A]:
         ...
 
+    async def get_many(self, _ids: Sequence[I_contra]) -> list[A]:
+        ...
+
     async def query(self, select: Q_contra) -> list[A]:
         ...
 
+    async def query_rows(self, select: Q_contra) -> list[Row]:
+        ...
+
+    def stream_rows(
+        self, select: Q_contra, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        ...
+
     async def delete(self, _aggregate: A) -> None:
         ...
 
+    async def delete_many(self, _ids: Sequence[I_contra]) -> int:
+        ...
+
 
 IBookRepository = ICollectionOrientedRepository[Book, UUID, Select]
 IPublisherRepository = ICollectionOrientedRepository[Publisher, UUID, Select]
+
+
+class IOperationRepository(
+    ICollectionOrientedRepository[Operation, UUID, Select], Protocol
+):
+    async def claim(
+        self, _id: UUID, _owner: str, _lease_expire_time: datetime
+    ) -> bool:
+        ...
@@ -2,7 +2,7 @@ from types import TracebackType
 from typing import Optional, Protocol
 
 from typing_extensions import Self
-from .repository import IPublisherRepository, IBookRepository
+from .repository import IPublisherRepository, IBookRepository, IOperationRepository
 
 
 class IContextManagerUnitOfWork(Protocol):
@@ -28,3 +28,4 @@ class IUnitOfWork(IContextManagerUnitOfWork, Protocol):
 
     books: IBookRepository
     publishers: IPublisherRepository
+    operations: IOperationRepository
@@ -1,21 +1,32 @@
-from datetime import datetime
+import os
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable
+from uuid import UUID, uuid4
+
 from domino.domino import touch
+from sqlalchemy import select
 
 from ...domain.publisher import Publisher
 from ...domain.book import Book
+from ...domain.operation import CANCELLED, INTERNAL, Operation
 from ...port.unit_of_work import IUnitOfWork
 from ..blocks import commands, events
+from ..pipeline import MAX_FAILURES, BooksImportPipeline, ImportChunk, read_rows
 
 
-async def create_publisher(cmd: commands.CreatePublisher, Uow: type[IUnitOfWork]):
+async def create_publisher(
+    cmd: commands.CreatePublisher, Uow: Callable[[], IUnitOfWork]
+) -> UUID:
     publisher = Publisher(id=cmd.id, title=cmd.title)
     async with Uow() as uow:
         await uow.publishers.add(publisher)
         await uow.commit()
     touch(events.PublisherCreated(id=cmd.id))
+    return cmd.id
 
 
-async def create_book(cmd: commands.CreateBook, Uow: type[IUnitOfWork]):
+async def create_book(cmd: commands.CreateBook, Uow: Callable[[], IUnitOfWork]) -> UUID:
     book = Book(
         id=cmd.id,
         publisher_id=cmd.publisher_id,
@@ -26,12 +37,195 @@ async def create_book(cmd: commands.CreateBook, Uow: type[IUnitOfWork]):
         await uow.books.add(book)
         await uow.commit()
     touch(events.BookCreated(id=cmd.id))
+    return cmd.id
+
+
+async def create_books(
+    cmd: commands.CreateBooks, Uow: Callable[[], IUnitOfWork]
+) -> list[UUID]:
+    books = [
+        Book(
+            id=book.id,
+            publisher_id=book.publisher_id,
+            title=book.title,
+            author_name=book.author_name,
+        )
+        for book in cmd.books
+    ]
+    async with Uow() as uow:
+        await uow.books.add_many(books)
+        await uow.commit()
+    ids = [book.id for book in books]
+    touch(events.BooksCreated(ids=tuple(ids)))
+    return ids
 
 
-async def delete_book(cmd: commands.DeleteBook, Uow: type[IUnitOfWork]):
+async def delete_book(cmd: commands.DeleteBook, Uow: Callable[[], IUnitOfWork]):
     async with Uow() as uow:
         book = await uow.books.get(cmd.id)
         assert book
         await uow.books.delete(book)
         await uow.commit()
     touch(events.BookDeleted(id=cmd.id))
+
+
+async def delete_books(
+    cmd: commands.DeleteBooks, Uow: Callable[[], IUnitOfWork]
+) -> tuple[list[UUID], dict[UUID, str]]:
+    failures: dict[UUID, str] = {}
+    async with Uow() as uow:
+        requested = [book_id for _, book_id in cmd.books]
+        found = await uow.books.query_rows(
+            select(Book.id, Book.publisher_id).where(Book.id.in_(requested))  # type: ignore
+        )
+        owners = {row.id: row.publisher_id for row in found}
+        for publisher_id, book_id in cmd.books:
+            if book_id not in owners:
+                failures[book_id] = "not found"
+            elif publisher_id is not None and owners[book_id] != publisher_id:
+                failures[book_id] = "belongs to another publisher"
+        if failures and cmd.all_or_nothing:
+            return [], failures
+        ids = [book_id for _, book_id in cmd.books if book_id not in failures]
+        if not ids:
+            return [], failures
+        await uow.books.delete_many(ids)
+        await uow.commit()
+    touch(events.BooksDeleted(ids=tuple(ids)))
+    return ids, failures
+
+
+async def create_books_import(
+    cmd: commands.CreateBooksImport, Uow: Callable[[], IUnitOfWork]
+) -> UUID:
+    operation = Operation(
+        id=cmd.id,
+        kind="books:import",
+        parent_id=cmd.publisher_id,
+        source_path=cmd.source_path,
+        source_format=cmd.source_format,
+    )
+    try:
+        async with Uow() as uow:
+            await uow.operations.add(operation)
+            await uow.commit()
+    except BaseException:
+        # no operation refers to the spooled upload, nothing else would remove it
+        if os.path.exists(cmd.source_path):
+            os.remove(cmd.source_path)
+        raise
+    return cmd.id
+
+
+async def run_books_import(
+    cmd: commands.RunBooksImport,
+    Uow: Callable[[], IUnitOfWork],
+    chunk_size: int = 1000,
+    workers: int = 4,
+    lease_seconds: float = 60.0,
+    max_attempts: int = 3,
+):
+    # every run claims the operation under its own owner, so processes resuming
+    # the same operation after a restart do not import its rows twice
+    owner = uuid4().hex
+    lease = timedelta(seconds=lease_seconds)
+    async with Uow() as uow:
+        operation = await uow.operations.get(cmd.id)
+        assert operation
+        if operation.done:
+            return
+        claimed = await uow.operations.claim(cmd.id, owner, datetime.utcnow() + lease)
+        if claimed:
+            # earlier runs lost their lease without finishing, a crashing or stuck
+            # import is not resumed forever
+            operation.attempts += 1
+            if operation.attempts > max_attempts:
+                operation.done = True
+                operation.error_code = INTERNAL
+                operation.error_message = f"gave up after {max_attempts} attempts."
+                operation.update_time = datetime.utcnow()
+        await uow.commit()
+    if not claimed:
+        return
+    if operation.done:
+        if os.path.exists(operation.source_path):
+            os.remove(operation.source_path)
+        return
+
+    # books and progress are committed together, so a restart resumes exactly
+    async def on_chunk(uow: IUnitOfWork, chunk: ImportChunk) -> bool:
+        # the lease is renewed with every chunk, a run that lost it stops
+        if not await uow.operations.claim(cmd.id, owner, datetime.utcnow() + lease):
+            return False
+        operation = await uow.operations.get(cmd.id)
+        assert operation
+        operation.update_time = datetime.utcnow()
+        if operation.cancel_requested:
+            operation.error_code = CANCELLED
+            operation.error_message = "cancelled by request."
+            operation.done = True
+            return False
+        operation.processed_rows += chunk.processed_rows
+        operation.created_rows += chunk.created_books
+        operation.failed_rows += len(chunk.failures)
+        if len(operation.failures) < MAX_FAILURES:
+            operation.failures = [*operation.failures, *chunk.failures][:MAX_FAILURES]
+        return True
+
+    pipeline = BooksImportPipeline(
+        Uow,
+        publisher_id=operation.parent_id,
+        chunk_size=chunk_size,
+        workers=workers,
+        on_chunk=on_chunk,
+    )
+    done = False
+    try:
+        with open(operation.source_path, newline="", encoding="utf-8") as file:
+            # rows before processed_rows were committed by an earlier run
+            rows = islice(
+                read_rows(file, operation.source_format),
+                operation.processed_rows,
+                None,
+            )
+            report = await pipeline.run(rows, first_row=operation.processed_rows + 1)
+        if report.cancelled:
+            async with Uow() as uow:
+                operation = await uow.operations.get(cmd.id)
+                assert operation
+            # cancelled by request, or the lease moved to another run
+            done = operation.done
+        else:
+            async with Uow() as uow:
+                operation = await uow.operations.get(cmd.id)
+                assert operation
+                operation.done = True
+                operation.update_time = datetime.utcnow()
+                await uow.commit()
+            done = True
+    except Exception as e:
+        async with Uow() as uow:
+            operation = await uow.operations.get(cmd.id)
+            assert operation
+            operation.done = True
+            operation.error_code = INTERNAL
+            operation.error_message = str(e)[:255]
+            operation.update_time = datetime.utcnow()
+            await uow.commit()
+        done = True
+        raise e
+    finally:
+        if done and os.path.exists(operation.source_path):
+            os.remove(operation.source_path)
+
+
+async def cancel_operation(
+    cmd: commands.CancelOperation, Uow: Callable[[], IUnitOfWork]
+):
+    async with Uow() as uow:
+        operation = await uow.operations.get(cmd.id)
+        assert operation
+        if not operation.done:
+            operation.cancel_requested = True
+            operation.update_time = datetime.utcnow()
+            await uow.commit()
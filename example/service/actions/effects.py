@@ -6,3 +6,14 @@ async def send_mail(eft: effects.SendMail, email_sender: IEmailSender):
     await email_sender.send(
         from_=eft.from_, to_list=[eft.to], title=eft.title, body=eft.body
     )
+
+
+def merge_send_mails(efts: list[effects.SendMail]) -> effects.SendMail:
+    if len(efts) == 1:
+        return efts[0]
+    return effects.SendMail(
+        from_=efts[0].from_,
+        to=efts[0].to,
+        title=f"{efts[0].title} (+{len(efts) - 1})",
+        body="\n".join(eft.body for eft in efts),
+    )
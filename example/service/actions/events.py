@@ -1,6 +1,8 @@
 from domino.domino import touch
 from loguru import logger
 
+from ...domain.book import Book
+from ...port.cache import IIdentityCache
 from ..blocks import events, effects
 
 
@@ -8,8 +10,10 @@ async def publisher_created(evt: events.PublisherCreated):
     logger.info(f"publisher created. (id={evt.id})")
 
 
-async def book_created(evt: events.BookCreated):
+async def book_created(evt: events.BookCreated, cache: IIdentityCache | None = None):
     logger.info(f"book created. (id={evt.id}")
+    if cache:
+        cache.invalidate(Book, evt.id)
     touch(
         effects.SendMail(
             from_="admin@example.com",
@@ -20,5 +24,29 @@ async def book_created(evt: events.BookCreated):
     )
 
 
-async def book_deleted(evt: events.BookDeleted):
+async def books_created(evt: events.BooksCreated, cache: IIdentityCache | None = None):
+    logger.info(f"books created. (count={len(evt.ids)})")
+    if cache:
+        for id in evt.ids:
+            cache.invalidate(Book, id)
+    touch(
+        effects.SendMail(
+            from_="admin@example.com",
+            to="client",
+            title=f"{len(evt.ids)} Books Created!",
+            body="\n".join(f"book's id is {id}" for id in evt.ids),
+        )
+    )
+
+
+async def book_deleted(evt: events.BookDeleted, cache: IIdentityCache | None = None):
     logger.info(f"book deleted. (id={evt.id}")
+    if cache:
+        cache.invalidate(Book, evt.id)
+
+
+async def books_deleted(evt: events.BooksDeleted, cache: IIdentityCache | None = None):
+    logger.info(f"books deleted. (count={len(evt.ids)})")
+    if cache:
+        for id in evt.ids:
+            cache.invalidate(Book, id)
@@ -18,6 +18,38 @@ class CreateBook(IBlock):
     author_name: str
 
 
+@dataclass(frozen=True, kw_only=True)
+class CreateBooks(IBlock):
+    books: tuple[CreateBook, ...]
+
+
 @dataclass(frozen=True, kw_only=True)
 class DeleteBook(IBlock):
     id: UUID
+
+
+@dataclass(frozen=True, kw_only=True)
+class DeleteBooks(IBlock):
+    # (publisher_id, id) pairs, publisher_id is None when the parent is not checked
+    books: tuple[tuple[UUID | None, UUID], ...]
+    all_or_nothing: bool = True
+
+
+@dataclass(frozen=True, kw_only=True)
+class CreateBooksImport(IBlock):
+    id: UUID
+    # None imports into the publisher_id of each row
+    publisher_id: UUID | None
+
+    source_path: str
+    source_format: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class RunBooksImport(IBlock):
+    id: UUID
+
+
+@dataclass(frozen=True, kw_only=True)
+class CancelOperation(IBlock):
+    id: UUID
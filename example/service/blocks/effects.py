@@ -1,10 +1,23 @@
-from dataclasses import dataclass
-from domino.block import IBlock
+from dataclasses import asdict, dataclass
+from json import dumps, loads
+
+from domino.block import IBlock, IExternalBlock, IPublicBlock
+from typing_extensions import Self
 
 
 @dataclass(frozen=True, kw_only=True)
-class SendMail(IBlock):
+class SendMail(IPublicBlock, IExternalBlock):
     from_: str = "admin@example.com"
     to: str
     title: str
     body: str
+
+    def to_json(self) -> str:
+        return dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, json: str) -> Self:
+        return cls(**loads(json))
+
+    async def fall_down(self) -> list[IBlock]:
+        return [self]
@@ -13,6 +13,16 @@ class BookCreated(IBlock):
     id: UUID
 
 
+@dataclass(frozen=True, kw_only=True)
+class BooksCreated(IBlock):
+    ids: tuple[UUID, ...]
+
+
 @dataclass(frozen=True, kw_only=True)
 class BookDeleted(IBlock):
     id: UUID
+
+
+@dataclass(frozen=True, kw_only=True)
+class BooksDeleted(IBlock):
+    ids: tuple[UUID, ...]
@@ -0,0 +1,308 @@
+import asyncio
+import csv
+import json
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Awaitable, Callable, Iterator, TextIO
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+
+from domino.action import run_in_threadpool
+
+from ..domain.book import Book
+from ..domain.publisher import Publisher
+from ..port.unit_of_work import IUnitOfWork
+
+# only the first failures are kept, the rest are counted
+MAX_FAILURES = 100
+
+RawRow = dict[str, Any] | None
+# (number, title, author_name, publisher_id, publisher_title)
+ValidRow = tuple[int, str, str, UUID | None, str | None]
+Failure = tuple[int, str]
+
+
+#
+# Parse
+#
+def read_rows(file: TextIO, format: str) -> Iterator[RawRow]:
+    if format == "csv":
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+#
+# Validate
+#
+def validate_rows(
+    rows: list[tuple[int, RawRow]], publisher_id: UUID | None
+) -> tuple[list[ValidRow], list[Failure], float]:
+    # runs in a thread or a process pool, so arguments and results stay picklable
+    started_at = time.perf_counter()
+    valid: list[ValidRow] = []
+    failures: list[Failure] = []
+    for number, row in rows:
+        try:
+            valid.append(_validate_row(number, row, publisher_id))
+        except ValueError as e:
+            failures.append((number, str(e)))
+    return valid, failures, time.perf_counter() - started_at
+
+
+def _validate_row(number: int, row: RawRow, publisher_id: UUID | None) -> ValidRow:
+    if row is None:
+        raise ValueError("not a json object")
+    title = row.get("title", None)
+    author_name = row.get("author_name", None)
+    if not isinstance(title, str) or not title:
+        raise ValueError("title is required")
+    if not isinstance(author_name, str) or not author_name:
+        raise ValueError("author_name is required")
+    if publisher_id is not None:
+        return number, title, author_name, publisher_id, None
+    if row.get("publisher_id", None):
+        return number, title, author_name, UUID(str(row["publisher_id"])), None
+    publisher_title = row.get("publisher_title", None)
+    if isinstance(publisher_title, str) and publisher_title:
+        return number, title, author_name, None, publisher_title
+    raise ValueError("publisher_id or publisher_title is required")
+
+
+#
+# Report
+#
+@dataclass
+class StageReport:
+    name: str
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class ImportChunk:
+    processed_rows: int
+    created_books: int
+    created_publishers: int
+    failures: list[str]
+
+
+@dataclass
+class ImportReport:
+    processed_rows: int = 0
+    created_books: int = 0
+    created_publishers: int = 0
+    failed_rows: int = 0
+    failures: list[str] = field(default_factory=list)
+    cancelled: bool = False
+    seconds: float = 0.0
+    stages: dict[str, StageReport] = field(
+        default_factory=lambda: {
+            name: StageReport(name) for name in ("read", "validate", "write")
+        }
+    )
+
+
+#
+# Pipeline
+#
+# read -> validate -> write. at most queue_size batches are in flight, so a slow
+# writer stalls the reader instead of buffering the file. batches never straddle
+# a chunk and chunks are written in order, one transaction each, so the rows
+# committed so far are always a prefix of the input.
+# on_chunk runs in a chunk's transaction before anything is written, returning
+# False commits only what it changed and stops the import.
+class BooksImportPipeline:
+    def __init__(
+        self,
+        Uow: Callable[[], IUnitOfWork],
+        *,
+        publisher_id: UUID | None = None,
+        chunk_size: int = 1000,
+        batch_size: int = 250,
+        workers: int = 4,
+        queue_size: int = 8,
+        executor: Executor | None = None,
+        on_chunk: Callable[[IUnitOfWork, ImportChunk], Awaitable[bool]] | None = None,
+    ) -> None:
+        self.Uow = Uow
+        self.publisher_id = publisher_id
+        self.chunk_size = chunk_size
+        self.batch_size = min(batch_size, chunk_size)
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor = executor
+        self.on_chunk = on_chunk
+        self.report = ImportReport()
+        self._publisher_ids: dict[str, UUID] = {}
+        self._known_publisher_ids: set[UUID] = set()
+
+    async def run(self, rows: Iterator[RawRow], first_row: int = 1) -> ImportReport:
+        started_at = time.perf_counter()
+        batches: asyncio.Queue[asyncio.Future[Any] | None] = asyncio.Queue(
+            self.queue_size
+        )
+        executor = self.executor or ThreadPoolExecutor(self.workers)
+        reader = asyncio.create_task(self._read(rows, first_row, batches, executor))
+        try:
+            await self._write(batches)
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+            if self.executor is None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self.report.seconds = time.perf_counter() - started_at
+        return self.report
+
+    async def _read(
+        self,
+        rows: Iterator[RawRow],
+        number: int,
+        batches: asyncio.Queue[asyncio.Future[Any] | None],
+        executor: Executor,
+    ):
+        loop = asyncio.get_running_loop()
+        stage = self.report.stages["read"]
+        remaining = self.chunk_size
+        try:
+            while True:
+                started_at = time.perf_counter()
+                batch = await run_in_threadpool(
+                    list, islice(rows, min(self.batch_size, remaining))
+                )
+                stage.seconds += time.perf_counter() - started_at
+                if not batch:
+                    break
+                stage.rows += len(batch)
+                remaining = remaining - len(batch) or self.chunk_size
+                numbered = list(enumerate(batch, number))
+                number += len(batch)
+                await batches.put(
+                    loop.run_in_executor(
+                        executor, validate_rows, numbered, self.publisher_id
+                    )
+                )
+        except Exception as e:
+            failed = loop.create_future()
+            failed.set_exception(e)
+            await batches.put(failed)
+            return
+        await batches.put(None)
+
+    async def _write(self, batches: asyncio.Queue[asyncio.Future[Any] | None]):
+        stage = self.report.stages["validate"]
+        valid: list[ValidRow] = []
+        failures: list[Failure] = []
+        processed = 0
+        while (future := await batches.get()) is not None:
+            batch_valid, batch_failures, seconds = await future
+            stage.rows += len(batch_valid) + len(batch_failures)
+            stage.seconds += seconds
+            valid.extend(batch_valid)
+            failures.extend(batch_failures)
+            processed += len(batch_valid) + len(batch_failures)
+            if processed == self.chunk_size:
+                if not await self._write_chunk(processed, valid, failures):
+                    return
+                valid, failures, processed = [], [], 0
+        if processed:
+            await self._write_chunk(processed, valid, failures)
+
+    async def _write_chunk(
+        self, processed: int, valid: list[ValidRow], failures: list[Failure]
+    ) -> bool:
+        started_at = time.perf_counter()
+        async with self.Uow() as uow:
+            books, publishers = await self._resolve(uow, valid, failures)
+            chunk = ImportChunk(
+                processed_rows=processed,
+                created_books=len(books),
+                created_publishers=len(publishers),
+                failures=[
+                    f"row {number}: {message}" for number, message in sorted(failures)
+                ],
+            )
+            if self.on_chunk is not None and not await self.on_chunk(uow, chunk):
+                await uow.commit()
+                self.report.cancelled = True
+                return False
+            await uow.publishers.add_many(publishers)
+            await uow.books.add_many(books)
+            await uow.commit()
+        report = self.report
+        report.processed_rows += chunk.processed_rows
+        report.created_books += chunk.created_books
+        report.created_publishers += chunk.created_publishers
+        report.failed_rows += len(chunk.failures)
+        report.failures.extend(chunk.failures[: MAX_FAILURES - len(report.failures)])
+        stage = report.stages["write"]
+        stage.rows += processed
+        stage.seconds += time.perf_counter() - started_at
+        return True
+
+    async def _resolve(
+        self, uow: IUnitOfWork, rows: list[ValidRow], failures: list[Failure]
+    ) -> tuple[list[Book], list[Publisher]]:
+        # publishers named by title are looked up once and created at most once
+        titles = {
+            title
+            for *_, title in rows
+            if title is not None and title not in self._publisher_ids
+        }
+        if titles:
+            found = await uow.publishers.query_rows(
+                select(Publisher.id, Publisher.title).where(Publisher.title.in_(titles))  # type: ignore
+            )
+            for row in found:
+                self._publisher_ids.setdefault(row.title, row.id)
+        publishers = [
+            Publisher(id=uuid4(), title=title)
+            for title in sorted(titles.difference(self._publisher_ids))
+        ]
+        self._publisher_ids.update(
+            (publisher.title, publisher.id) for publisher in publishers
+        )
+
+        publisher_ids = {
+            publisher_id
+            for _, _, _, publisher_id, _ in rows
+            if publisher_id is not None and publisher_id != self.publisher_id
+        }.difference(self._known_publisher_ids)
+        if publisher_ids:
+            found_publishers = await uow.publishers.get_many(list(publisher_ids))
+            self._known_publisher_ids.update(
+                publisher.id for publisher in found_publishers
+            )
+
+        books: list[Book] = []
+        for number, title, author_name, publisher_id, publisher_title in rows:
+            if publisher_title is not None:
+                publisher_id = self._publisher_ids[publisher_title]
+            elif (
+                publisher_id != self.publisher_id
+                and publisher_id not in self._known_publisher_ids
+            ):
+                failures.append((number, f"publisher {publisher_id} not found"))
+                continue
+            assert publisher_id
+            books.append(
+                Book(
+                    id=uuid4(),
+                    publisher_id=publisher_id,
+                    title=title,
+                    author_name=author_name,
+                )
+            )
+        return books, publishers
@@ -0,0 +1,140 @@
+import asyncio
+import json
+from dataclasses import asdict, dataclass
+
+from domino.budget import Budget
+from domino.coalesce import Merge
+from domino.domino import Domino, touch
+from domino.transport import Message, Serializer, Transport
+
+
+@dataclass(frozen=True, kw_only=True)
+class CreateThing:
+    name: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class Ping:
+    n: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class ThingCreated:
+    names: tuple[str, ...]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+
+class FlakyBroker:
+    def __init__(self) -> None:
+        self.failing = True
+        self.published: list[bytes] = []
+
+    async def publish(self, topic: str, bodies: list[bytes]) -> None:
+        if self.failing:
+            raise OSError("database is locked")
+        self.published.extend(bodies)
+
+    async def claim(
+        self, topic: str, group: str, consumer: str, limit: int
+    ) -> list[Message]:
+        return []
+
+    async def ack(self, group: str, messages: list[Message]) -> None:
+        ...
+
+
+def _domino(broker: FlakyBroker, coalesce: bool) -> Domino:
+    domino = Domino()
+
+    async def create_thing(cmd: CreateThing):
+        touch(ThingCreated(names=(cmd.name,)))
+        return cmd.name
+
+    domino.place(CreateThing, create_thing)
+    domino.route(ThingCreated, Transport(broker, Serializer([])))
+    if coalesce:
+        domino.coalesce(
+            ThingCreated,
+            Merge(
+                lambda events: ThingCreated(
+                    names=tuple(name for event in events for name in event.names)
+                ),
+                window=0.01,
+            ),
+        )
+    return domino
+
+
+def test_failed_send_does_not_fail_the_command():
+    async def main():
+        broker = FlakyBroker()
+        domino = _domino(broker, coalesce=False)
+        result = await domino.start(CreateThing(name="a"))
+        letters = list(domino.dead_letters)
+        broker.failing = False
+        replayed = await domino.replay()
+        return result, letters, replayed, broker.published
+
+    result, letters, replayed, published = asyncio.run(main())
+    assert result == "a"
+    assert [letter.block for letter in letters] == [ThingCreated(names=("a",))]
+    assert isinstance(letters[0].exception, OSError)
+    assert replayed == 1
+    assert len(published) == 1
+
+
+def test_failed_send_of_coalesced_blocks_is_dead_lettered():
+    async def main():
+        broker = FlakyBroker()
+        domino = _domino(broker, coalesce=True)
+        await asyncio.gather(
+            domino.start(CreateThing(name="a")), domino.start(CreateThing(name="b"))
+        )
+        await asyncio.sleep(0.05)
+        letters = list(domino.dead_letters)
+        broker.failing = False
+        await domino.replay()
+        return letters, broker.published
+
+    letters, published = asyncio.run(main())
+    assert [sorted(letter.block.names) for letter in letters] == [["a", "b"]]
+    assert len(published) == 1
+
+
+def _ping_domino(step: int) -> tuple[Domino, list[int]]:
+    domino = Domino(budget=Budget(max_depth=4))
+    runs: list[int] = []
+
+    async def ping(block: Ping):
+        runs.append(block.n)
+        touch(Ping(n=block.n + step))
+
+    domino.place(Ping, ping)
+    domino.coalesce(Ping, Merge(lambda blocks: blocks[-1], window=0.01))
+    return domino, runs
+
+
+def test_coalesced_self_touching_block_runs_into_the_depth_limit():
+    async def main():
+        domino, runs = _ping_domino(step=1)
+        await domino.start(Ping(n=0))
+        await asyncio.sleep(0.3)
+        return domino, runs
+
+    domino, runs = asyncio.run(main())
+    assert runs == [0, 1, 2, 3, 4]
+    assert domino.budget.violations["depth"] == 1
+
+
+def test_coalesced_self_touching_block_runs_into_the_cycle_check():
+    async def main():
+        domino, runs = _ping_domino(step=0)
+        await domino.start(Ping(n=0))
+        await asyncio.sleep(0.1)
+        return domino, runs
+
+    domino, runs = asyncio.run(main())
+    assert runs == [0]
+    assert domino.budget.violations["cycle"] == 1
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from domino.scheduler import Priority, Scheduler
+
+
+def test_release_skips_waiter_cancelled_before_waking():
+    async def main():
+        scheduler = Scheduler(concurrency=1)
+        gate = asyncio.Event()
+
+        async def hold():
+            await gate.wait()
+            return "a"
+
+        async def value(result: str):
+            return result
+
+        holder = asyncio.create_task(scheduler.run(Priority.NORMAL, hold))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(scheduler.run(Priority.NORMAL, lambda: value("w")))
+        other = asyncio.create_task(scheduler.run(Priority.NORMAL, lambda: value("b")))
+        await asyncio.sleep(0)
+        # the holder releases its slot before the cancelled waiter wakes
+        gate.set()
+        waiter.cancel()
+        results = await asyncio.gather(holder, waiter, other, return_exceptions=True)
+        return scheduler, results
+
+    scheduler, results = asyncio.run(main())
+    assert results[0] == "a"
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[2] == "b"
+    assert scheduler._running == 0
+    assert not any(scheduler._queues.values())
+
+
+def test_nested_run_uses_the_callers_slot():
+    async def main():
+        scheduler = Scheduler(concurrency=1)
+
+        async def inner():
+            return "inner"
+
+        async def outer():
+            return await scheduler.run(Priority.HIGH, inner)
+
+        return await asyncio.wait_for(scheduler.run(Priority.LOW, outer), 1)
+
+    assert asyncio.run(main()) == "inner"
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_cancelled_holder_releases_its_slot(concurrency: int):
+    async def main():
+        scheduler = Scheduler(concurrency=concurrency)
+        holders = [
+            asyncio.create_task(scheduler.run(Priority.NORMAL, asyncio.Event().wait))
+            for _ in range(concurrency)
+        ]
+        await asyncio.sleep(0)
+        for holder in holders:
+            holder.cancel()
+        await asyncio.gather(*holders, return_exceptions=True)
+        return scheduler._running
+
+    assert asyncio.run(main()) == 0
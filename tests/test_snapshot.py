@@ -0,0 +1,75 @@
+import asyncio
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from example.adapter.orm import book_table, mapper_registry, publisher_table
+from example.adapter.snapshot import (
+    SNAPSHOT_FORMATS,
+    export_snapshot,
+    read_snapshot_table,
+)
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_incremental_snapshot_exports_changed_and_deleted_rows(
+    tmp_path: Path, format: str
+):
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+        publisher_id = uuid4()
+        books = [
+            dict(
+                id=uuid4(),
+                publisher_id=publisher_id,
+                title=f"title {i}",
+                author_name="author",
+                _version_number=1,
+            )
+            for i in range(5)
+        ]
+        async with engine.begin() as conn:
+            await conn.run_sync(mapper_registry.metadata.create_all)
+            await conn.execute(
+                insert(publisher_table),
+                [dict(id=publisher_id, title="publisher", _version_number=1)],
+            )
+            await conn.execute(insert(book_table), books)
+        first = await export_snapshot(
+            engine, str(tmp_path / "1"), format=format, batch_size=2
+        )
+        async with engine.begin() as conn:
+            await conn.execute(
+                update(book_table)
+                .where(book_table.c.id == books[0]["id"])
+                .values(title="changed", _version_number=2)
+            )
+            await conn.execute(
+                delete(book_table).where(book_table.c.id == books[1]["id"])
+            )
+        second = await export_snapshot(
+            engine,
+            str(tmp_path / "2"),
+            format=format,
+            base=str(tmp_path / "1"),
+            batch_size=2,
+        )
+        await engine.dispose()
+        return books, first, second
+
+    books, first, second = asyncio.run(main())
+    assert first.tables["books"].rows == 5
+    assert first.tables["books"].exported_rows == 5
+    assert second.tables["books"].rows == 4
+    assert second.tables["books"].exported_rows == 1
+    assert second.tables["books"].deleted_rows == 1
+    assert second.tables["publishers"].exported_rows == 0
+    exported = read_snapshot_table(str(tmp_path / "2"), "books")
+    assert exported.column("title").to_pylist() == ["changed"]
+    deleted = tmp_path / "2" / ("books.deleted" + SNAPSHOT_FORMATS[format])
+    assert deleted.exists()